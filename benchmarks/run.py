@@ -0,0 +1,235 @@
+"""
+Offline end-to-end benchmark of ResearchAgent.research
+
+Starts the local stand-in servers from benchmarks/stubs.py, then runs the
+agent against them for every combination of source count and concurrency
+settings. Each combination runs in a fresh subprocess, because the config
+is read from the environment at import time and caches must start cold.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sources 5 10 --fetch-workers 5 10 --iterations 5
+    python -m benchmarks.run --compare benchmarks/results/bench-20250101-120000.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from benchmarks.stubs import StubConfig, StubServers
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics where a larger value is an improvement; everything else should shrink
+HIGHER_IS_BETTER = {"throughput"}
+
+COMPARED_METRICS = ("p50", "p95", "throughput", "bytes", "tracemalloc_peak", "max_rss")
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percentile / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def run_worker(iterations: int) -> Dict:
+    """
+    Run the agent in this process and measure it (configured via environment)
+
+    Args:
+        iterations (int): Number of research questions to run
+
+    Returns:
+        Dict: Latency, throughput, byte and memory figures
+    """
+    from src.components.research_agent import ResearchAgent
+
+    tracemalloc.start()
+    agent = ResearchAgent()
+    latencies = []
+    bytes_fetched = 0
+    sources = 0
+    failures = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        # Unique questions so no run is served from another run's cache
+        question = f"benchmark question {i} {uuid.uuid4().hex[:8]}"
+        t0 = time.perf_counter()
+        report = agent.research(question)
+        latencies.append(time.perf_counter() - t0)
+        if "error" in report:
+            failures += 1
+            continue
+        sources += len(report.get("sources", []))
+        bytes_fetched += sum(
+            span["attributes"].get("bytes", 0)
+            for span in report.get("timings", [])
+        )
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "failures": failures,
+        "p50": round(_percentile(latencies, 50), 4),
+        "p95": round(_percentile(latencies, 95), 4),
+        "mean": round(statistics.mean(latencies), 4) if latencies else 0.0,
+        "throughput": round(iterations / elapsed, 4) if elapsed else 0.0,
+        "sources": sources,
+        "bytes": bytes_fetched,
+        "tracemalloc_peak": peak,
+        # ru_maxrss is kilobytes on Linux
+        "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "llm": agent.summarizer.scheduler.stats()
+    }
+
+
+def run_case(stubs: StubServers, sources: int, fetch_workers: int, llm_workers: int, iterations: int, llm_rpm: int) -> Dict:
+    """Run one benchmark configuration in a subprocess with a cold cache"""
+    with tempfile.TemporaryDirectory(prefix="citesight-bench-") as cache_dir:
+        env = dict(os.environ)
+        env.update(stubs.env)
+        env.update({
+            "CITESIGHT_CACHE_DIR": cache_dir,
+            "CITESIGHT_MAX_SEARCH_RESULTS": str(sources),
+            "CITESIGHT_MAX_FETCH_WORKERS": str(fetch_workers),
+            "CITESIGHT_MAX_LLM_WORKERS": str(llm_workers),
+            "CITESIGHT_LLM_REQUESTS_PER_MINUTE": str(llm_rpm),
+            "CITESIGHT_SEARCH_REQUESTS_PER_MINUTE": "6000",
+            "PYTHONPATH": ROOT_DIR + os.pathsep + env.get("PYTHONPATH", "")
+        })
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--worker", "--iterations", str(iterations)],
+            cwd=ROOT_DIR,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark worker failed:\n{completed.stderr}")
+    # The agent prints progress and errors to stdout; the result is the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, metrics: Iterable[str] = COMPARED_METRICS) -> List[str]:
+    """
+    Compare two saved benchmark runs case by case
+
+    Args:
+        current (Dict): Results of this run
+        baseline (Dict): Previously saved results
+        threshold (float): Relative change (e.g. 0.1 for 10%) treated as a regression
+        metrics (Iterable[str]): Names of the metrics to compare
+
+    Returns:
+        List[str]: Human-readable descriptions of the regressions found
+    """
+    previous = {case["name"]: case["metrics"] for case in baseline.get("cases", [])}
+    regressions = []
+    for case in current["cases"]:
+        old = previous.get(case["name"])
+        if old is None:
+            continue
+        for metric in metrics:
+            before, after = old.get(metric), case["metrics"].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append(f"{case['name']}: {metric} {before} -> {after} ({change:+.1%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark CiteSight against local stand-in servers")
+    parser.add_argument("--sources", type=int, nargs="+", default=[5, 10], help="Sources per question")
+    parser.add_argument("--fetch-workers", type=int, nargs="+", default=[5], help="Concurrent fetches")
+    parser.add_argument("--llm-workers", type=int, nargs="+", default=[3], help="Concurrent LLM calls")
+    parser.add_argument("--iterations", type=int, default=3, help="Questions per configuration")
+    parser.add_argument("--llm-rpm", type=int, default=6000, help="LLM requests per minute allowed")
+    parser.add_argument("--page-bytes", type=int, default=20000, help="Size of each served page")
+    parser.add_argument("--page-latency", type=float, default=0.2, help="Seconds before a page is served")
+    parser.add_argument("--llm-delay", type=float, default=1.0, help="Seconds before a completion is returned")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of completions failing with 429/502")
+    parser.add_argument("--sub-questions", type=int, default=2, help="Sub-questions the stand-in LLM splits each question into")
+    parser.add_argument("--output", help="Where to save results (default: benchmarks/results/bench-<time>.json)")
+    parser.add_argument("--compare", help="Saved results to check for regressions against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported as a regression")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.iterations)))
+        return
+
+    stub_config = StubConfig(
+        page_bytes=args.page_bytes,
+        page_latency=args.page_latency,
+        llm_delay=args.llm_delay,
+        llm_error_rate=args.llm_error_rate,
+        sub_questions=args.sub_questions,
+        results_per_query=max(args.sources) * 2
+    )
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "stubs": vars(stub_config),
+        "cases": []
+    }
+
+    with StubServers(stub_config) as stubs:
+        for sources, fetch_workers, llm_workers in itertools.product(args.sources, args.fetch_workers, args.llm_workers):
+            name = f"sources={sources} fetch={fetch_workers} llm={llm_workers}"
+            print(f"Running {name} ...", flush=True)
+            metrics = run_case(stubs, sources, fetch_workers, llm_workers, args.iterations, args.llm_rpm)
+            results["cases"].append({
+                "name": name,
+                "sources": sources,
+                "fetch_workers": fetch_workers,
+                "llm_workers": llm_workers,
+                "metrics": metrics
+            })
+            print(
+                f"  p50 {metrics['p50']:.2f}s  p95 {metrics['p95']:.2f}s  "
+                f"{metrics['throughput']:.3f} q/s  {metrics['bytes'] / 1024:.0f} KiB  "
+                f"peak {metrics['tracemalloc_peak'] / 2 ** 20:.1f} MiB  rss {metrics['max_rss'] / 2 ** 20:.0f} MiB",
+                flush=True
+            )
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved results to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
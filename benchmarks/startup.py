@@ -0,0 +1,157 @@
+"""
+Cold-start benchmark
+
+Measures, in fresh processes, how long it takes to import the agent, construct
+it and answer a first and a second question against the local stand-in
+servers, and which heavy modules are loaded along the way. Startup time
+matters whenever new app or service instances are scaled up.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --compare benchmarks/results/startup-20250101-120000.json
+    python -m benchmarks.startup --importtime
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.run import ROOT_DIR, RESULTS_DIR, compare
+from benchmarks.stubs import StubConfig, StubServers
+
+# Modules that should only be loaded once they are actually needed
+HEAVY_MODULES = ("trafilatura", "lxml", "bs4", "pypdf", "pandas", "altair", "numpy")
+
+METRICS = ("import", "construct", "first_request", "second_request")
+
+
+def run_worker() -> Dict:
+    """Time the startup phases in this (fresh) process"""
+    start = time.perf_counter()
+    from src.components.research_agent import ResearchAgent
+    imported = time.perf_counter()
+    heavy_after_import = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    agent = ResearchAgent()
+    constructed = time.perf_counter()
+
+    agent.research("startup benchmark first question")
+    first = time.perf_counter()
+    agent.research("startup benchmark second question")
+    second = time.perf_counter()
+
+    return {
+        "import": round(imported - start, 4),
+        "construct": round(constructed - imported, 4),
+        "first_request": round(first - constructed, 4),
+        "second_request": round(second - first, 4),
+        "modules_after_import": len(sys.modules),
+        "heavy_after_import": heavy_after_import
+    }
+
+
+def run_once(stubs: StubServers) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="citesight-startup-") as cache_dir:
+        env = dict(os.environ)
+        env.update(stubs.env)
+        env.update({
+            "CITESIGHT_CACHE_DIR": cache_dir,
+            "CITESIGHT_MAX_SEARCH_RESULTS": "3",
+            "CITESIGHT_LLM_REQUESTS_PER_MINUTE": "6000",
+            "CITESIGHT_SEARCH_REQUESTS_PER_MINUTE": "6000",
+            "PYTHONPATH": ROOT_DIR + os.pathsep + env.get("PYTHONPATH", "")
+        })
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--worker"],
+            cwd=ROOT_DIR,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup worker failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def import_profile(limit: int = 15) -> List[str]:
+    """Return the modules with the largest cumulative import time (python -X importtime)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.components.research_agent"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), name))
+    rows.sort(reverse=True)
+    return [f"{cumulative / 1000:8.1f} ms  {name}" for cumulative, name in rows[:limit]]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark CiteSight cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes to measure")
+    parser.add_argument("--output", help="Where to save results (default: benchmarks/results/startup-<time>.json)")
+    parser.add_argument("--compare", help="Saved results to check for regressions against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative change reported as a regression")
+    parser.add_argument("--importtime", action="store_true", help="Show the slowest imports and exit")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker()))
+        return
+    if args.importtime:
+        print("\n".join(import_profile()))
+        return
+
+    # Near-instant stand-ins, so the figures are dominated by our own startup work
+    stub_config = StubConfig(results_per_query=6, page_latency=0.0, page_jitter=0.0, llm_delay=0.0, llm_jitter=0.0)
+    samples = []
+    with StubServers(stub_config) as stubs:
+        for i in range(args.runs):
+            samples.append(run_once(stubs))
+            print(f"Run {i + 1}: " + "  ".join(f"{m} {samples[-1][m]:.3f}s" for m in METRICS), flush=True)
+
+    metrics = {metric: round(statistics.median(s[metric] for s in samples), 4) for metric in METRICS}
+    metrics["modules_after_import"] = samples[-1]["modules_after_import"]
+    heavy = samples[-1]["heavy_after_import"]
+    print("Median: " + "  ".join(f"{m} {metrics[m]:.3f}s" for m in METRICS))
+    if heavy:
+        print(f"Heavy modules loaded at import: {', '.join(heavy)}")
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "heavy_after_import": heavy,
+        "cases": [{"name": "startup", "metrics": metrics}]
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved results to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, metrics=METRICS)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+
+class StubConfig:
+    """Knobs for the local stand-in servers"""
+
+    def __init__(
+        self,
+        results_per_query: int = 10,
+        page_bytes: int = 20000,
+        page_latency: float = 0.2,
+        page_jitter: float = 0.1,
+        llm_delay: float = 1.0,
+        llm_jitter: float = 0.5,
+        llm_error_rate: float = 0.0,
+        sub_questions: int = 2,
+        seed: int = 0
+    ):
+        self.results_per_query = results_per_query
+        self.page_bytes = page_bytes
+        self.page_latency = page_latency
+        self.page_jitter = page_jitter
+        self.llm_delay = llm_delay
+        self.llm_jitter = llm_jitter
+        self.llm_error_rate = llm_error_rate
+        self.sub_questions = sub_questions
+        self.seed = seed
+
+
+def _vocabulary(size: int = 5000, seed: int = 0):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stubs: "StubServers" = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path.startswith("/html"):
+            self._search(parse_qs(parsed.query).get("q", [""])[0])
+        elif parsed.path.startswith("/page/"):
+            self._page(parsed.path)
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        if not self.path.startswith("/api/v1/chat/completions"):
+            self._send(404, b"not found", "text/plain")
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        self._chat(json.loads(self.rfile.read(length) or b"{}"))
+
+    def _search(self, query: str):
+        config = self.stubs.config
+        key = hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+        results = []
+        for i in range(config.results_per_query):
+            url = f"{self.stubs.base_url}/page/{key}/{i}"
+            results.append(
+                '<div class="result">'
+                f'<a class="result__a" href="//duckduckgo.com/l/?uddg={quote(url, safe="")}&amp;rut=x">Result {i} for {query}</a>'
+                f'<a class="result__snippet" href="{url}">Snippet {i}</a>'
+                "</div>"
+            )
+        body = f"<html><body>{''.join(results)}</body></html>".encode("utf-8")
+        self._send(200, body, "text/html; charset=utf-8")
+
+    def _page(self, path: str):
+        config = self.stubs.config
+        time.sleep(max(0.0, config.page_latency + random.uniform(-config.page_jitter, config.page_jitter)))
+        # Deterministic text per path, distinct across paths so pages don't look like mirrors
+        rng = random.Random(f"{config.seed}:{path}")
+        vocab = self.stubs.vocabulary
+        paragraphs = []
+        size = 0
+        while size < config.page_bytes:
+            sentence_count = rng.randint(3, 7)
+            paragraph = " ".join(
+                " ".join(rng.choice(vocab) for _ in range(rng.randint(8, 20))).capitalize() + "."
+                for _ in range(sentence_count)
+            )
+            paragraphs.append(f"<p>{paragraph}</p>")
+            size += len(paragraph) + 7
+        body = (
+            f"<html><head><title>Page {path}</title></head>"
+            f"<body><article><h1>Page {path}</h1>{''.join(paragraphs)}</article></body></html>"
+        ).encode("utf-8")
+        self._send(200, body, "text/html; charset=utf-8")
+
+    def _chat(self, payload: dict):
+        config = self.stubs.config
+        time.sleep(max(0.0, config.llm_delay + random.uniform(-config.llm_jitter, config.llm_jitter)))
+        if random.random() < config.llm_error_rate:
+            if random.random() < 0.5:
+                self._send(429, b'{"error": "rate limited"}', "application/json", {"Retry-After": "1"})
+            else:
+                self._send(502, b'{"error": "upstream error"}', "application/json")
+            return
+
+        prompt = payload.get("messages", [{}])[0].get("content", "")
+        if '"sub_questions"' in prompt:
+            question = prompt.rsplit("Research question:", 1)[-1].strip()
+            content = json.dumps({
+                "sub_questions": [f"{question} (aspect {i + 1})" for i in range(config.sub_questions)]
+            })
+        elif '"agreements"' in prompt:
+            content = json.dumps({
+                "agreements": ["Sources agree on the main point"],
+                "contradictions": [],
+                "unique_points": ["One source adds detail"],
+                "confidence": "medium"
+            })
+        else:
+            content = json.dumps({
+                "summary": "A stand-in summary of the page.",
+                "key_points": ["First point", "Second point", "Third point"],
+                "quotes": ["A notable quote"],
+                "confidence_level": "medium"
+            })
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+
+        if not payload.get("stream"):
+            body = json.dumps({"choices": [{"message": {"content": content}}], "usage": usage}).encode("utf-8")
+            self._send(200, body, "application/json")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+        for start in range(0, len(content), 16):
+            chunk = {"choices": [{"delta": {"content": content[start:start + 16]}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(f"data: {json.dumps({'choices': [{'delta': {}}], 'usage': usage})}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+class StubServers:
+    """
+    Local stand-ins for DuckDuckGo, the web and OpenRouter on one port
+
+    - GET  /html/?q=...               DuckDuckGo-style HTML result page
+    - GET  /page/<query>/<n>          article pages of configurable size and latency
+    - POST /api/v1/chat/completions   chat completions with tunable delay and error rate
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        self.config = config or StubConfig()
+        self.vocabulary = _vocabulary(seed=self.config.seed)
+        handler = type("Handler", (_Handler,), {"stubs": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def env(self) -> dict:
+        """Environment variables that point CiteSight's config at these servers"""
+        return {
+            "CITESIGHT_SEARCH_URL": f"{self.base_url}/html/",
+            "CITESIGHT_OPENROUTER_API_URL": f"{self.base_url}/api/v1/chat/completions",
+            "OPENROUTER_API_KEY": "benchmark"
+        }
+
+    def start(self) -> "StubServers":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "StubServers":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
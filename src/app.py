@@ -1,6 +1,16 @@
 import streamlit as st
-import json
 from src.components.research_agent import ResearchAgent
+from src.components.report import ResearchReport, SourceSummary
+from src.service import ResearchClient
+from src.config.config import SERVICE_URL, OPENROUTER_API_KEY
+from src.components.events import (
+    SearchCompleted,
+    SourceFetched,
+    SummaryPartial,
+    SummaryReady,
+    CrossValidationReady,
+    ResearchCompleted
+)
 import time
 
 # Page config
@@ -57,9 +67,13 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_research_agent():
+    """One agent per server process, shared by all sessions together with its caches and rate limits"""
+    # A research service, when configured, shares them across processes too
+    return ResearchClient(SERVICE_URL) if SERVICE_URL else ResearchAgent()
+
 # Initialize session state
-if 'research_agent' not in st.session_state:
-    st.session_state.research_agent = ResearchAgent()
 if 'research_complete' not in st.session_state:
     st.session_state.research_complete = False
 if 'current_report' not in st.session_state:
@@ -75,9 +89,22 @@ st.markdown("""
     4. Generate a cited report
 """)
 
+if not SERVICE_URL and not OPENROUTER_API_KEY:
+    st.warning("OPENROUTER_API_KEY is not set, so sources can't be summarized. Add it to your `.env` file.")
+
 # Input section
 question = st.text_area("Enter your research question:", height=100)
 
+# Deadline mode
+with st.sidebar:
+    st.header("Settings")
+    deadline_mode = st.checkbox("Deadline mode", help="Stop once enough sources are in or time runs out")
+    time_budget = None
+    target_sources = None
+    if deadline_mode:
+        time_budget = st.number_input("Time budget (seconds)", min_value=10, max_value=600, value=60, step=10)
+        target_sources = st.number_input("Target number of sources", min_value=1, max_value=10, value=3)
+
 # Research button
 if st.button("Start Research"):
     if not question:
@@ -91,20 +118,68 @@ if st.button("Start Research"):
             # Create progress bar
             progress_bar = st.progress(0)
             status_text = st.empty()
+            live_results = st.container()
             
             # Start research
-            status_text.text("Starting research...")
-            progress_bar.progress(10)
+            status_text.text("Searching for sources...")
             
-            # Conduct research
-            report = st.session_state.research_agent.research(question)
+            # Conduct research, rendering each source as it is processed
+            report = None
+            total_sources = 0
+            completed_units = 0
+            titles = {}
+            live_slots = {}
+            for event in get_research_agent().research_iter(
+                question,
+                time_budget=time_budget,
+                target_sources=target_sources
+            ):
+                if isinstance(event, SearchCompleted):
+                    total_sources += len(event.results)
+                    progress_bar.progress(10)
+                    status_text.text(f"Found {total_sources} sources, fetching content...")
+                elif isinstance(event, SourceFetched):
+                    # A failed fetch won't produce a summary, so it completes both units
+                    completed_units += 1 if event.success else 2
+                    titles[event.index] = event.title or event.url
+                    status_text.text(f"Fetched {event.url}")
+                elif isinstance(event, SummaryPartial):
+                    # Show the summary while it is still being generated
+                    if event.index not in live_slots:
+                        live_slots[event.index] = live_results.empty()
+                    with live_slots[event.index].container():
+                        st.markdown(f"**{titles.get(event.index, event.url)}** _(generating...)_")
+                        st.markdown(event.partial.get("summary", ""))
+                        for point in event.partial.get("key_points", []):
+                            st.markdown(f"- {point}")
+                elif isinstance(event, SummaryReady):
+                    completed_units += 1
+                    if event.index not in live_slots:
+                        live_slots[event.index] = live_results.empty()
+                    summary_data = SourceSummary.from_dict(event.summary)
+                    if summary_data.parsed:
+                        with live_slots[event.index].container():
+                            with st.expander(event.source["title"] or event.source["url"], expanded=False):
+                                st.markdown(summary_data.summary)
+                                for point in summary_data.key_points:
+                                    st.markdown(f"- {point}")
+                elif isinstance(event, CrossValidationReady):
+                    progress_bar.progress(95)
+                    status_text.text("Cross-validation complete, compiling report...")
+                elif isinstance(event, ResearchCompleted):
+                    report = event.report
+                
+                if total_sources and isinstance(event, (SourceFetched, SummaryReady)):
+                    progress_bar.progress(10 + int(80 * min(completed_units, 2 * total_sources) / (2 * total_sources)))
+                    if completed_units >= 2 * total_sources:
+                        status_text.text("Cross-validating sources...")
             
             # Update progress
             progress_bar.progress(100)
             status_text.text("Research complete!")
             
-            # Store results
-            st.session_state.current_report = report
+            # Store results, parsed once so reruns only re-render them
+            st.session_state.current_report = ResearchReport.from_dict(report, question)
             st.session_state.research_complete = True
             
             # Rerun to update display
@@ -116,176 +191,183 @@ if st.button("Start Research"):
 # Display results if research is complete
 if st.session_state.research_complete and st.session_state.current_report:
     report = st.session_state.current_report
-    
+
     # Check for errors
-    if "error" in report:
-        st.error(f"Research encountered an error: {report['error']}")
+    if report.error:
+        st.error(f"Research encountered an error: {report.error}")
         st.write("Research Log:")
-        st.json(report["research_log"])
+        st.json(report.research_log)
     else:
         # Display summaries
         st.header("Research Results")
-        
+        if len(report.sub_questions) > 1:
+            st.markdown("Researched as: " + " · ".join(report.sub_questions))
+
         # Sources
         st.subheader("Sources")
-        for source in report["sources"]:
+        for source in report.sources:
             st.markdown(f"- [{source['title']}]({source['url']})")
-        
+            for mirror in source.get("also_at", []):
+                st.markdown(f"    - also at {mirror}")
+
         # Summaries
         st.subheader("Key Findings")
-        for i, summary in enumerate(report["summaries"]):
-            try:
-                # Try to parse the JSON content
-                summary_data = json.loads(summary["summary"])
-                
-                # Skip if summary is empty or contains no meaningful content
-                if not summary_data.get("summary") and not summary_data.get("key_points") and not summary_data.get("quotes"):
-                    continue
-                    
-                with st.expander(f"Summary {i+1}"):
-                    # Display formatted summary
-                    st.markdown("### Summary")
-                    st.markdown(summary_data.get("summary", ""))
-                    
-                    if summary_data.get("key_points"):
-                        st.markdown("### Key Points")
-                        for point in summary_data["key_points"]:
-                            st.markdown(f"- {point}")
-                    
-                    if summary_data.get("quotes"):
-                        st.markdown("### Notable Quotes")
-                        for quote in summary_data["quotes"]:
-                            st.markdown(f"> {quote}")
-                    
-                    st.markdown("### Confidence Level")
-                    st.info(f"Confidence: {summary_data.get('confidence_level', 'Not specified')}")
-                    
-                    # Option to view raw JSON
-                    if st.checkbox(f"View raw JSON for Summary {i+1}", key=f"raw_json_{i}"):
-                        st.json(summary["summary"])
-            except:
-                # Skip if JSON parsing fails
+        for i, summary_data in enumerate(report.summaries):
+            # Skip if summary is empty or contains no meaningful content
+            if not summary_data.has_content:
                 continue
-        
+
+            with st.expander(f"Summary {i+1}"):
+                # Display formatted summary
+                st.markdown("### Summary")
+                st.markdown(summary_data.summary)
+
+                if summary_data.key_points:
+                    st.markdown("### Key Points")
+                    for point in summary_data.key_points:
+                        st.markdown(f"- {point}")
+
+                if summary_data.quotes:
+                    st.markdown("### Notable Quotes")
+                    for quote in summary_data.quotes:
+                        st.markdown(f"> {quote}")
+
+                st.markdown("### Confidence Level")
+                st.info(f"Confidence: {summary_data.confidence_level}")
+
+                # Option to view raw JSON
+                if st.checkbox(f"View raw JSON for Summary {i+1}", key=f"raw_json_{i}"):
+                    st.json(summary_data.raw)
+
         # Cross-validation
         st.subheader("Cross-Validation Analysis")
-        try:
-            # Try to parse the cross-validation JSON
-            cross_val = json.loads(report["cross_validation"]["cross_validation"])
-            
+        cross_val = report.cross_validation
+        if cross_val.parsed:
             # Agreements
-            if cross_val.get("agreements"):
+            if cross_val.agreements:
                 st.markdown("### Points of Agreement")
-                points_list = "\n".join([f"✓ {agreement}" for agreement in cross_val["agreements"]])
+                points_list = "\n".join([f"✓ {agreement}" for agreement in cross_val.agreements])
                 st.markdown(f"""
                 <div class="agreement">
                     {points_list}
                 </div>
                 """, unsafe_allow_html=True)
-            
+
             # Contradictions
-            if cross_val.get("contradictions"):
+            if cross_val.contradictions:
                 st.markdown("### Points of Contradiction")
-                points_list = "\n".join([f"⚠️ {contradiction}" for contradiction in cross_val["contradictions"]])
+                points_list = "\n".join([f"⚠️ {contradiction}" for contradiction in cross_val.contradictions])
                 st.markdown(f"""
                 <div class="contradiction">
                     {points_list}
                 </div>
                 """, unsafe_allow_html=True)
-            
+
             # Unique points
-            if cross_val.get("unique_points"):
+            if cross_val.unique_points:
                 st.markdown("### Unique Information")
-                points_list = "\n".join([f"🔍 {point}" for point in cross_val["unique_points"]])
+                points_list = "\n".join([f"🔍 {point}" for point in cross_val.unique_points])
                 st.markdown(f"""
                 <div class="key-finding">
                     {points_list}
                 </div>
                 """, unsafe_allow_html=True)
-            
+
             # Overall confidence
             st.markdown("### Overall Confidence Assessment")
-            st.info(cross_val.get("confidence", "Not specified"))
-            
+            st.info(cross_val.confidence)
+
             # Option to view raw cross-validation JSON
             if st.checkbox("View raw cross-validation JSON"):
-                st.json(report["cross_validation"])
-        except:
-            # Fallback to raw text if JSON parsing fails
-            st.write(report["cross_validation"]["cross_validation"])
-        
+                st.json(cross_val.raw)
+        else:
+            # Fallback to raw text if JSON parsing failed
+            st.write(cross_val.text)
+
+        # Sources abandoned in deadline mode
+        if report.dropped_sources:
+            with st.expander(f"Dropped Sources ({len(report.dropped_sources)})"):
+                for dropped in report.dropped_sources:
+                    reason = "out of time" if dropped["reason"] == "deadline" else "enough sources already"
+                    st.markdown(f"- {dropped['url']} ({reason})")
+
         # Research log
         with st.expander("View Research Log"):
-            st.json(report["research_log"])
-        
-        # Export options
-        col1, col2 = st.columns(2)
-        
+            st.json(report.research_log)
+
+        # Per-stage latency waterfall
+        if report.timings:
+            with st.expander("Latency Waterfall"):
+                import altair as alt
+                import pandas as pd
+                from urllib.parse import urlparse
+
+                rows = []
+                for span in report.timings:
+                    target = span["attributes"].get("url") or span["attributes"].get("sub_question", "")
+                    rows.append({
+                        "stage": span["name"],
+                        "label": f"{span['name']} {urlparse(target).netloc or target}".strip(),
+                        "start": span["start"],
+                        "end": span["start"] + span["duration"],
+                        "duration": span["duration"],
+                        "bytes": span["attributes"].get("bytes", 0),
+                        "tokens": span["attributes"].get("prompt_tokens", 0) + span["attributes"].get("completion_tokens", 0),
+                        "cache_hits": span["attributes"].get("cache_hits", 0),
+                        "retries": span["attributes"].get("retries", 0)
+                    })
+                chart = alt.Chart(pd.DataFrame(rows)).mark_bar().encode(
+                    x=alt.X("start:Q", title="Seconds"),
+                    x2="end:Q",
+                    y=alt.Y("label:N", sort=None, title=None),
+                    color="stage:N",
+                    tooltip=["stage", "label", "duration", "bytes", "tokens", "cache_hits", "retries"]
+                )
+                st.altair_chart(chart, use_container_width=True)
+
+                metrics_col1, metrics_col2 = st.columns(2)
+                with metrics_col1:
+                    st.download_button(
+                        label="Download Metrics (Prometheus)",
+                        data=report.prometheus_export,
+                        file_name="research_metrics.prom",
+                        mime="text/plain"
+                    )
+                with metrics_col2:
+                    st.download_button(
+                        label="Download Spans (JSON Lines)",
+                        data=report.json_lines_export,
+                        file_name="research_spans.jsonl",
+                        mime="application/x-ndjson"
+                    )
+
+        # Export options, each built once per report and reused on reruns
+        col1, col2, col3 = st.columns(3)
+
         with col1:
             st.download_button(
                 label="Download Report (JSON)",
-                data=json.dumps(report, indent=2),
+                data=report.json_export,
                 file_name="research_report.json",
                 mime="application/json"
             )
-        
-        with col2:
-            # Create a readable text version of the report
-            txt_content = f"""CiteSight Research Report
-            
-Research Question:
-{question}
-
-Sources:
-{chr(10).join([f"- {source['title']}: {source['url']}" for source in report['sources']])}
-
-Key Findings:
-"""
-            # Add summaries
-            for i, summary in enumerate(report["summaries"]):
-                try:
-                    summary_data = json.loads(summary["summary"])
-                    if summary_data.get("summary") or summary_data.get("key_points") or summary_data.get("quotes"):
-                        txt_content += f"\nSummary {i+1}:\n"
-                        txt_content += f"Summary: {summary_data.get('summary', '')}\n"
-                        if summary_data.get("key_points"):
-                            txt_content += "\nKey Points:\n"
-                            txt_content += "\n".join([f"- {point}" for point in summary_data["key_points"]])
-                        if summary_data.get("quotes"):
-                            txt_content += "\n\nNotable Quotes:\n"
-                            txt_content += "\n".join([f"> {quote}" for quote in summary_data["quotes"]])
-                        txt_content += f"\nConfidence Level: {summary_data.get('confidence_level', 'Not specified')}\n"
-                except:
-                    continue
-
-            # Add cross-validation
-            try:
-                cross_val = json.loads(report["cross_validation"]["cross_validation"])
-                txt_content += "\n\nCross-Validation Analysis:\n"
-                
-                if cross_val.get("agreements"):
-                    txt_content += "\nPoints of Agreement:\n"
-                    txt_content += "\n".join([f"✓ {point}" for point in cross_val["agreements"]])
-                
-                if cross_val.get("contradictions"):
-                    txt_content += "\n\nPoints of Contradiction:\n"
-                    txt_content += "\n".join([f"⚠️ {point}" for point in cross_val["contradictions"]])
-                
-                if cross_val.get("unique_points"):
-                    txt_content += "\n\nUnique Information:\n"
-                    txt_content += "\n".join([f"🔍 {point}" for point in cross_val["unique_points"]])
-                
-                txt_content += f"\n\nOverall Confidence: {cross_val.get('confidence', 'Not specified')}"
-            except:
-                txt_content += "\nCross-validation data not available"
 
+        with col2:
             st.download_button(
                 label="Download Report (TXT)",
-                data=txt_content,
+                data=report.text_export,
                 file_name="research_report.txt",
                 mime="text/plain"
             )
 
+        with col3:
+            st.download_button(
+                label="Download Report (Markdown)",
+                data=report.markdown_export,
+                file_name="research_report.md",
+                mime="text/markdown"
+            )
+
 # Footer
 st.markdown("---")
 st.markdown("Made with ❤️ by CiteSight") 
\ No newline at end of file
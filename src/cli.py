@@ -0,0 +1,192 @@
+"""
+Headless batch research
+
+Reads one question per line from a file (or stdin) and researches them in a
+pool of worker processes. Each report is appended to a JSON Lines file as
+soon as it is done; rerunning with the same output file skips questions
+that already have a successful report.
+
+    python -m src.cli questions.txt -o reports.jsonl --workers 4
+    cat questions.txt | python -m src.cli - -o reports.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Set
+from src.tools.rate_limiter import LLMScheduler, SharedTokenBucket
+from src.config.config import LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, SEARCH_REQUESTS_PER_MINUTE, EXTRACT_WORKERS
+
+# The agent of each worker process, created once by _init_worker
+_agent = None
+
+
+def read_questions(lines: Iterable[str]) -> List[str]:
+    """Return the distinct non-empty questions, ignoring lines starting with #"""
+    questions = []
+    seen = set()
+    for line in lines:
+        question = line.strip()
+        if question and not question.startswith("#") and question not in seen:
+            seen.add(question)
+            questions.append(question)
+    return questions
+
+
+def completed_questions(path: str) -> Set[str]:
+    """
+    Return the questions that already have a successful report in a JSONL file
+
+    A line cut short by an interrupted run is ignored, so its question is
+    researched again.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "error" not in record.get("report", {}):
+                done.add(record.get("question"))
+    return done
+
+
+def _init_worker(request_bucket, token_bucket, search_bucket, extract_workers):
+    """Create this process's agent, drawing on the LLM and search budgets shared by all workers"""
+    global _agent
+    # Imported here so the parent process doesn't load the extraction stack it never uses
+    from src.components.research_agent import ResearchAgent
+    from src.tools.extractor import Extractor
+
+    _agent = ResearchAgent(
+        scheduler=LLMScheduler(request_bucket=request_bucket, token_bucket=token_bucket),
+        search_rate_limit=search_bucket,
+        extractor=Extractor(workers=extract_workers)
+    )
+    # A worker joins its child processes on exit, so the extraction pool has to be shut down first,
+    # before multiprocessing closes the queues (exitpriority 10) that tell its processes to stop
+    multiprocessing.util.Finalize(_agent, _agent.close, exitpriority=20)
+
+
+def _ends_with_newline(path: str) -> bool:
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return True
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _research(question: str, time_budget: Optional[float], target_sources: Optional[int]) -> Dict:
+    start = time.perf_counter()
+    report = _agent.research(question, time_budget=time_budget, target_sources=target_sources)
+    return {
+        "question": question,
+        "report": report,
+        "elapsed": round(time.perf_counter() - start, 3),
+        "worker": os.getpid()
+    }
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))] if ordered else 0.0
+
+
+def print_stats(records: List[Dict], skipped: int, pending: int, wall_time: float, stream=sys.stderr):
+    """Print throughput and latency figures for a batch"""
+    latencies = [r["elapsed"] for r in records]
+    failed = sum(1 for r in records if "error" in r["report"])
+    sources = sum(len(r["report"].get("sources", [])) for r in records)
+    print("", file=stream)
+    print(f"Questions researched: {len(records)} ({failed} failed), skipped: {skipped}, not run: {pending}", file=stream)
+    print(f"Wall time: {wall_time:.1f}s", file=stream)
+    if records and wall_time > 0:
+        print(f"Throughput: {len(records) / wall_time * 60:.2f} questions/min, {sources / wall_time * 60:.1f} sources/min", file=stream)
+        print(
+            f"Latency per question: p50 {_percentile(latencies, 50):.1f}s, "
+            f"p95 {_percentile(latencies, 95):.1f}s, max {max(latencies):.1f}s",
+            file=stream
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Research a batch of questions without the web interface")
+    parser.add_argument("questions", help="File with one question per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="reports.jsonl", help="JSON Lines file reports are appended to")
+    parser.add_argument("-w", "--workers", type=int, default=min(4, os.cpu_count() or 1), help="Worker processes")
+    parser.add_argument("--time-budget", type=float, help="Per-question time budget in seconds (deadline mode)")
+    parser.add_argument("--target-sources", type=int, help="Sources wanted per question (deadline mode)")
+    parser.add_argument("--no-resume", action="store_true", help="Research questions again even if they have reports")
+    args = parser.parse_args(argv)
+
+    if args.questions == "-":
+        questions = read_questions(sys.stdin)
+    else:
+        with open(args.questions, encoding="utf-8") as f:
+            questions = read_questions(f)
+
+    done = set() if args.no_resume else completed_questions(args.output)
+    todo = [q for q in questions if q not in done]
+    skipped = len(questions) - len(todo)
+    if skipped:
+        print(f"Skipping {skipped} questions that already have reports in {args.output}", file=sys.stderr)
+    if not todo:
+        return 0
+
+    # One LLM and search rate budget for the whole batch, however many processes share it
+    context = multiprocessing.get_context()
+    request_bucket = SharedTokenBucket(LLM_REQUESTS_PER_MINUTE, context=context)
+    token_bucket = SharedTokenBucket(LLM_TOKENS_PER_MINUTE, context=context)
+    search_bucket = SharedTokenBucket(SEARCH_REQUESTS_PER_MINUTE, context=context)
+    workers = max(1, min(args.workers, len(todo)))
+    # Split the extraction processes between the workers instead of starting EXTRACT_WORKERS in each
+    extract_workers = max(1, EXTRACT_WORKERS // workers) if EXTRACT_WORKERS else 0
+
+    records = []
+    start = time.perf_counter()
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(request_bucket, token_bucket, search_bucket, extract_workers)
+    )
+    try:
+        complete_last_line = _ends_with_newline(args.output)
+        with open(args.output, "a", encoding="utf-8") as out:
+            if not complete_last_line:
+                # Keep the next record off the line an interrupted run left unfinished
+                out.write("\n")
+            futures = {
+                executor.submit(_research, question, args.time_budget, args.target_sources): question
+                for question in todo
+            }
+            for future in as_completed(futures):
+                question = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    record = {"question": question, "report": {"error": str(e)}, "elapsed": 0.0, "worker": None}
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                records.append(record)
+                status = "failed" if "error" in record["report"] else "done"
+                print(f"[{len(records)}/{len(todo)}] {status} in {record['elapsed']:.1f}s: {question}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun with the same output file to continue", file=sys.stderr)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        print_stats(records, skipped, len(todo) - len(records), time.perf_counter() - start)
+
+    return 0 if all("error" not in r["report"] for r in records) and len(records) == len(todo) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
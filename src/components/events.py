@@ -0,0 +1,69 @@
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+
+@dataclass
+class ResearchEvent:
+    """Base class for progress events yielded by ResearchAgent.research_iter"""
+
+
+@dataclass
+class SearchCompleted(ResearchEvent):
+    """Search results are available for a sub-question"""
+    sub_question: str
+    results: List[Dict]
+
+
+@dataclass
+class SourceFetched(ResearchEvent):
+    """A search result was downloaded and extracted (or failed to be)"""
+    index: int
+    url: str
+    title: str = ""
+    success: bool = True
+
+
+@dataclass
+class SummaryPartial(ResearchEvent):
+    """More of a streamed summary has been parsed"""
+    index: int
+    url: str
+    partial: Dict
+
+
+@dataclass
+class SummaryReady(ResearchEvent):
+    """A source has been summarized"""
+    index: int
+    source: Dict
+    summary: Dict
+
+
+@dataclass
+class CrossValidationReady(ResearchEvent):
+    """Cross-validation across all summaries has finished"""
+    cross_validation: Dict
+
+
+@dataclass
+class ResearchCompleted(ResearchEvent):
+    """The final report, always the last event of a run"""
+    report: Dict
+
+
+def event_to_dict(event: ResearchEvent) -> Dict:
+    """Serialize an event to a JSON-compatible dict tagged with its type"""
+    return {"type": type(event).__name__, **asdict(event)}
+
+
+def event_from_dict(data: Dict) -> ResearchEvent:
+    """Rebuild an event serialized by event_to_dict"""
+    fields = dict(data)
+    event_type = _EVENT_TYPES[fields.pop("type")]
+    return event_type(**fields)
+
+
+_EVENT_TYPES = {
+    cls.__name__: cls
+    for cls in (SearchCompleted, SourceFetched, SummaryPartial, SummaryReady, CrossValidationReady, ResearchCompleted)
+}
@@ -0,0 +1,202 @@
+import json
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+from src.tools import tracing
+
+
+@dataclass
+class SourceSummary:
+    """A source's summary, parsed from the JSON string the summarizer returns"""
+    summary: str = ""
+    key_points: List[str] = field(default_factory=list)
+    quotes: List[str] = field(default_factory=list)
+    confidence_level: str = "Not specified"
+    raw: str = ""
+    parsed: bool = True
+
+    @classmethod
+    def from_dict(cls, summary: Dict) -> "SourceSummary":
+        raw = summary.get("summary", "")
+        try:
+            data = json.loads(raw)
+            if not isinstance(data, dict):
+                raise ValueError("summary is not a JSON object")
+        except (TypeError, ValueError):
+            return cls(raw=raw if isinstance(raw, str) else "", parsed=False)
+        return cls(
+            summary=data.get("summary", "") or "",
+            key_points=list(data.get("key_points") or []),
+            quotes=list(data.get("quotes") or []),
+            confidence_level=data.get("confidence_level") or "Not specified",
+            raw=raw
+        )
+
+    @property
+    def has_content(self) -> bool:
+        return self.parsed and bool(self.summary or self.key_points or self.quotes)
+
+
+@dataclass
+class CrossValidation:
+    """Cross-validation analysis; `text` holds the raw answer when it isn't valid JSON"""
+    agreements: List[str] = field(default_factory=list)
+    contradictions: List[str] = field(default_factory=list)
+    unique_points: List[str] = field(default_factory=list)
+    confidence: str = "Not specified"
+    text: str = ""
+    parsed: bool = True
+    raw: Dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, cross_validation: Dict) -> "CrossValidation":
+        text = cross_validation.get("cross_validation", "")
+        try:
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                raise ValueError("cross-validation is not a JSON object")
+        except (TypeError, ValueError):
+            return cls(text=str(text), parsed=False, raw=cross_validation)
+        return cls(
+            agreements=list(data.get("agreements") or []),
+            contradictions=list(data.get("contradictions") or []),
+            unique_points=list(data.get("unique_points") or []),
+            confidence=data.get("confidence") or "Not specified",
+            text=text,
+            raw=cross_validation
+        )
+
+
+@dataclass(eq=False)
+class ResearchReport:
+    """
+    A research report parsed once from the dict returned by ResearchAgent.research
+
+    The JSON, TXT and Markdown exports are built on first access and then
+    reused, so rendering the same report again costs next to nothing.
+    """
+    question: str
+    sub_questions: List[str] = field(default_factory=list)
+    sources: List[Dict] = field(default_factory=list)
+    summaries: List[SourceSummary] = field(default_factory=list)
+    cross_validation: CrossValidation = field(default_factory=CrossValidation)
+    dropped_sources: List[Dict] = field(default_factory=list)
+    research_log: List[Dict] = field(default_factory=list)
+    timings: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_dict(cls, report: Dict, question: str = "") -> "ResearchReport":
+        """
+        Parse a report dict
+
+        Args:
+            report (Dict): Report as returned by ResearchAgent.research
+            question (str): Question to use if the report doesn't carry one (error reports)
+
+        Returns:
+            ResearchReport: The parsed report
+        """
+        return cls(
+            question=report.get("question", question),
+            sub_questions=report.get("sub_questions", []),
+            sources=report.get("sources", []),
+            summaries=[SourceSummary.from_dict(s) for s in report.get("summaries", [])],
+            cross_validation=CrossValidation.from_dict(report.get("cross_validation", {})),
+            dropped_sources=report.get("dropped_sources", []),
+            research_log=report.get("research_log", []),
+            timings=report.get("timings", []),
+            error=report.get("error"),
+            data=report
+        )
+
+    @cached_property
+    def json_export(self) -> str:
+        return json.dumps(self.data, indent=2)
+
+    @cached_property
+    def text_export(self) -> str:
+        lines = [
+            "CiteSight Research Report",
+            "",
+            "Research Question:",
+            self.question,
+            "",
+            "Sources:"
+        ]
+        lines += [f"- {source['title']}: {source['url']}" for source in self.sources]
+        lines += ["", "Key Findings:"]
+        for i, summary in enumerate(self.summaries):
+            if not summary.has_content:
+                continue
+            lines += ["", f"Summary {i+1}:", f"Summary: {summary.summary}"]
+            if summary.key_points:
+                lines += ["", "Key Points:"] + [f"- {point}" for point in summary.key_points]
+            if summary.quotes:
+                lines += ["", "Notable Quotes:"] + [f"> {quote}" for quote in summary.quotes]
+            lines.append(f"Confidence Level: {summary.confidence_level}")
+
+        cross_val = self.cross_validation
+        lines += ["", ""]
+        if not cross_val.parsed:
+            lines.append("Cross-validation data not available")
+            return "\n".join(lines)
+        lines.append("Cross-Validation Analysis:")
+        if cross_val.agreements:
+            lines += ["", "Points of Agreement:"] + [f"✓ {point}" for point in cross_val.agreements]
+        if cross_val.contradictions:
+            lines += ["", "Points of Contradiction:"] + [f"⚠️ {point}" for point in cross_val.contradictions]
+        if cross_val.unique_points:
+            lines += ["", "Unique Information:"] + [f"🔍 {point}" for point in cross_val.unique_points]
+        lines += ["", f"Overall Confidence: {cross_val.confidence}"]
+        return "\n".join(lines)
+
+    @cached_property
+    def markdown_export(self) -> str:
+        lines = ["# CiteSight Research Report", "", f"**Question:** {self.question}", ""]
+        if len(self.sub_questions) > 1:
+            lines += ["**Researched as:**", ""] + [f"- {sub_q}" for sub_q in self.sub_questions] + [""]
+        lines += ["## Sources", ""]
+        for i, source in enumerate(self.sources):
+            lines.append(f"{i+1}. [{source['title'] or source['url']}]({source['url']})")
+            for mirror in source.get("also_at", []):
+                lines.append(f"    - also at <{mirror}>")
+
+        lines += ["", "## Key Findings"]
+        for i, summary in enumerate(self.summaries):
+            if not summary.has_content:
+                continue
+            lines += ["", f"### Summary {i+1}", "", summary.summary]
+            if summary.key_points:
+                lines += ["", "**Key points**", ""] + [f"- {point}" for point in summary.key_points]
+            for quote in summary.quotes:
+                lines += ["", f"> {quote}"]
+            lines += ["", f"_Confidence: {summary.confidence_level}_"]
+
+        cross_val = self.cross_validation
+        lines += ["", "## Cross-Validation Analysis", ""]
+        if not cross_val.parsed:
+            lines.append(cross_val.text or "Cross-validation data not available")
+        else:
+            for title, points in (
+                ("Points of Agreement", cross_val.agreements),
+                ("Points of Contradiction", cross_val.contradictions),
+                ("Unique Information", cross_val.unique_points)
+            ):
+                if points:
+                    lines += [f"### {title}", ""] + [f"- {point}" for point in points] + [""]
+            lines.append(f"**Overall confidence:** {cross_val.confidence}")
+
+        if self.dropped_sources:
+            lines += ["", "## Dropped Sources", ""]
+            lines += [f"- <{d['url']}> ({d['reason']})" for d in self.dropped_sources]
+        return "\n".join(lines) + "\n"
+
+    @cached_property
+    def prometheus_export(self) -> str:
+        return tracing.to_prometheus(self.timings)
+
+    @cached_property
+    def json_lines_export(self) -> str:
+        return tracing.to_json_lines(self.timings)
@@ -1,109 +1,790 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait, FIRST_COMPLETED
+from src.components.events import (
+    ResearchEvent,
+    SearchCompleted,
+    SourceFetched,
+    SummaryPartial,
+    SummaryReady,
+    CrossValidationReady,
+    ResearchCompleted
+)
+from src.components.research_log import LogRecord, ResearchLog
 from src.tools.search_tool import SearchTool
 from src.tools.content_retriever import ContentRetriever
+from src.tools.extractor import Extractor
 from src.tools.summarizer import Summarizer
+from src.tools.http_client import HttpClient
+from src.tools.page_cache import PageCache
+from src.tools.llm_cache import ResponseCache
+from src.tools.search_cache import SearchCache
+from src.tools.corpus_index import CorpusIndex
+from src.tools.passage_ranker import PassageRanker
+from src.tools.chunker import estimate_tokens
+from src.tools.dedup import DuplicateDetector
+from src.tools.question_splitter import split_question
+from src.tools.rate_limiter import LLMScheduler, TokenBucket
+from src.tools import tracing
+from src.config.config import (
+    MAX_FETCH_WORKERS,
+    MAX_LLM_WORKERS,
+    RESEARCH_TIME_BUDGET,
+    MAX_SEARCH_RESULTS,
+    MAX_SEARCH_CANDIDATES,
+    MAX_SUB_QUESTIONS,
+    DECOMPOSE_WITH_LLM,
+    DECOMPOSE_MIN_WORDS,
+    MIN_SOURCES_PER_SUB_QUESTION,
+    OVERPROVISION_FACTOR,
+    HEDGE_AFTER,
+    CROSS_VALIDATION_RESERVE,
+    PAGE_CACHE_ENABLED,
+    LLM_CACHE_ENABLED,
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_PERSIST,
+    CORPUS_INDEX_ENABLED,
+    PASSAGE_FILTER_ENABLED,
+    PASSAGE_BUDGET_TOKENS,
+    STREAM_SUMMARIES,
+    RESEARCH_LOG_MAX_ENTRIES,
+    RESEARCH_HISTORY_MAX_ENTRIES
+)
+import functools
+import itertools
+import math
+import queue
+import threading
 import time
 import json
 
+# Sentinel put on the event queue when a worker finishes
+_TASK_DONE = object()
+
+
+def _lazy(factory):
+    """
+    Property that builds a tool on first access
+
+    Concurrent first accesses build it only once. Assigning to the property
+    replaces the tool, e.g. to inject a different implementation.
+    """
+    name = "_" + factory.__name__
+
+    def get(self):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            with self._init_lock:
+                if name not in self.__dict__:
+                    self.__dict__[name] = factory(self)
+                return self.__dict__[name]
+
+    def set(self, value):
+        self.__dict__[name] = value
+
+    return property(get, set, doc=factory.__doc__)
+
+
 class ResearchAgent:
-    def __init__(self):
-        self.search_tool = SearchTool()
-        self.content_retriever = ContentRetriever()
-        self.summarizer = Summarizer()
-        self.research_log = []
-
-    def log_step(self, step: str, details: Dict):
-        """Log each step of the research process"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.research_log.append({
-            "timestamp": timestamp,
-            "step": step,
-            "details": details
-        })
-
-    def break_down_question(self, question: str) -> List[str]:
+    def __init__(
+        self,
+        scheduler: Optional[LLMScheduler] = None,
+        search_rate_limit: Optional[TokenBucket] = None,
+        extractor: Optional[Extractor] = None
+    ):
+        # Tools are built on first use, so creating an agent is cheap
+        self._init_lock = threading.RLock()
+        if scheduler is not None:
+            self.llm_scheduler = scheduler
+        if extractor is not None:
+            self.extractor = extractor
+        self._search_rate_limit = search_rate_limit
+        # Steps of recent runs; each report carries only its own run's steps
+        self.research_history = ResearchLog(RESEARCH_HISTORY_MAX_ENTRIES)
+        self._run_ids = itertools.count(1)
+        # Page downloads get their own limit so slow LLM calls don't starve them
+        self.fetch_semaphore = threading.BoundedSemaphore(MAX_FETCH_WORKERS)
+        # Hedged fetches run here so a primary and its backup can race
+        self._hedge_executor = ThreadPoolExecutor(max_workers=2 * MAX_FETCH_WORKERS, thread_name_prefix="hedge")
+
+    @_lazy
+    def http(self) -> HttpClient:
+        """One pooled transport shared by all tools keeps connections warm"""
+        return HttpClient()
+
+    @_lazy
+    def search_cache(self) -> Optional[SearchCache]:
+        if not SEARCH_CACHE_ENABLED:
+            return None
+        return self._open_cache(SearchCache.persistent if SEARCH_CACHE_PERSIST else SearchCache)
+
+    @_lazy
+    def search_tool(self) -> SearchTool:
+        return SearchTool(http=self.http, cache=self.search_cache, rate_limit=self._search_rate_limit)
+
+    @_lazy
+    def page_cache(self) -> Optional[PageCache]:
+        return self._open_cache(PageCache) if PAGE_CACHE_ENABLED else None
+
+    @_lazy
+    def extractor(self) -> Extractor:
+        """HTML extraction is CPU-bound, so it runs in worker processes shared by all fetches"""
+        return Extractor()
+
+    @_lazy
+    def content_retriever(self) -> ContentRetriever:
+        return ContentRetriever(http=self.http, cache=self.page_cache, extractor=self.extractor)
+
+    @_lazy
+    def llm_cache(self) -> Optional[ResponseCache]:
+        return self._open_cache(ResponseCache) if LLM_CACHE_ENABLED else None
+
+    @_lazy
+    def llm_scheduler(self) -> LLMScheduler:
+        """All OpenRouter calls share one rate limiter, which also caps their concurrency"""
+        return LLMScheduler()
+
+    @_lazy
+    def summarizer(self) -> Summarizer:
+        return Summarizer(http=self.http, cache=self.llm_cache, scheduler=self.llm_scheduler)
+
+    @_lazy
+    def corpus_index(self) -> Optional[CorpusIndex]:
+        """Pages read by earlier runs, searched before going to the web"""
+        return self._open_cache(CorpusIndex) if CORPUS_INDEX_ENABLED else None
+
+    @_lazy
+    def passage_ranker(self) -> PassageRanker:
+        return PassageRanker()
+
+    def close(self):
+        """
+        Stop the extraction workers and close the caches, index and connections
+
+        Only tools that were built are closed. The agent can't be used afterwards.
+        """
+        self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+        for name in ("_extractor", "_search_cache", "_page_cache", "_llm_cache", "_corpus_index", "_http"):
+            tool = self.__dict__.get(name)
+            if tool is None:
+                continue
+            try:
+                if name == "_extractor":
+                    # Wait for the extraction processes, so none outlive the agent
+                    tool.close(wait=True)
+                else:
+                    tool.close()
+            except Exception as e:
+                print(f"Error closing {name[1:]}: {str(e)}")
+
+    def _open_cache(self, factory):
+        """Open a cache, running without it if the cache directory is unusable"""
+        try:
+            return factory()
+        except Exception as e:
+            print(f"Error opening {factory.__qualname__}, continuing without it: {str(e)}")
+            return None
+
+    def log_step(self, step: str, details: Dict, run: "_ResearchRun"):
+        """Log a step of a research run to the run's log and the agent's history"""
+        record = LogRecord(time.time(), run.run_id, step, details)
+        run.log.append(record)
+        self.research_history.append(record)
+
+    def break_down_question(self, question: str, max_sub_questions: int = MAX_SUB_QUESTIONS) -> List[str]:
         """
         Break down a complex question into sub-questions
-        Currently using a simple approach - in a production environment,
-        this would use an LLM to generate more sophisticated sub-questions
+
+        The LLM proposes up to max_sub_questions focused sub-questions (its
+        answer is cached like any other completion). Questions shorter than
+        DECOMPOSE_MIN_WORDS are not worth that call. If it is skipped,
+        disabled or fails, a compound question is split into its separate
+        questions.
         """
-        # For now, we'll just use the main question
-        return [question]
+        sub_questions = []
+        if DECOMPOSE_WITH_LLM and max_sub_questions > 1 and len(question.split()) >= DECOMPOSE_MIN_WORDS:
+            sub_questions = self.summarizer.decompose(question, max_sub_questions)
+        if not sub_questions:
+            sub_questions = split_question(question, max_sub_questions)
+        return sub_questions or [question]
 
-    def research(self, question: str) -> Dict:
+    def _search_all(self, sub_questions: List[str], run: "_ResearchRun") -> List[List[Dict]]:
         """
-        Conduct research on a given question
-        
+        Search for all sub-questions concurrently, returning the results in sub-question order
+
+        A sub-question whose search fails gets no results, so the others can
+        still be researched.
+
+        Raises:
+            Exception: A search failed and none of the others found anything
+        """
+        errors = []
+
+        def search(sub_q: str) -> List[Dict]:
+            with tracing.use(run.tracer), tracing.span("search", sub_question=sub_q):
+                try:
+                    # Extra candidates replace results another sub-question already claimed
+                    return self.search_tool.search(sub_q, max_results=MAX_SEARCH_CANDIDATES)
+                except Exception as e:
+                    print(f"Error searching for {sub_q!r}: {str(e)}")
+                    errors.append(e)
+                    return []
+
+        if len(sub_questions) == 1:
+            results = [search(sub_questions[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(sub_questions), thread_name_prefix="search") as executor:
+                results = list(executor.map(search, sub_questions))
+        if errors and not any(results):
+            raise errors[0]
+        return results
+
+    def _search_local(self, sub_questions: List[str], limit: int, run: "_ResearchRun") -> List[List[Dict]]:
+        """
+        Look up each sub-question in the local corpus index
+
+        Returns:
+            List[List[Dict]]: Up to `limit` stored pages covering each
+            sub-question, shaped like search results and marked as indexed
+        """
+        if self.corpus_index is None:
+            return [[] for _ in sub_questions]
+        local_results = []
+        for sub_q in sub_questions:
+            with tracing.use(run.tracer), tracing.span("local_search", sub_question=sub_q) as span:
+                try:
+                    results = self.corpus_index.search(sub_q, limit)
+                except Exception as e:
+                    print(f"Error searching the local index: {str(e)}")
+                    results = []
+                span.attributes["results"] = len(results)
+            local_results.append([dict(result, indexed=True) for result in results])
+        return local_results
+
+    def _select_results(
+        self,
+        results: List[Dict],
+        selected: List[Dict],
+        limit: int,
+        sub_q: str,
+        run: "_ResearchRun"
+    ) -> List[Dict]:
+        """
+        Add results to a sub-question's selection until it holds `limit`
+
+        Pages that are already being fetched (under the same or another URL)
+        are skipped.
+
+        Returns:
+            List[Dict]: `selected`, extended in place
+        """
+        for result in results:
+            if len(selected) >= limit:
+                break
+            kept = run.duplicates.check_url(result["link"])
+            if kept is None:
+                selected.append(result)
+            else:
+                self.log_step("duplicate_url", {
+                    "url": result["link"],
+                    "duplicate_of": kept,
+                    "sub_question": sub_q
+                }, run)
+        return selected
+
+    def _index_page(self, content: Dict[str, str]):
+        """Add a fetched page to the corpus index, so follow-up questions can use it"""
+        if self.corpus_index is None:
+            return
+        try:
+            with tracing.span("index", url=content["url"]):
+                self.corpus_index.add(content["url"], content["title"], content["content"])
+        except Exception as e:
+            print(f"Error indexing {content['url']}: {str(e)}")
+
+    def _fetch(self, url: str, run: "_ResearchRun") -> Optional[Dict[str, str]]:
+        """
+        Fetch a page, sending a duplicate request if the first one is slow
+
         Args:
-            question (str): The research question
-            
+            url (str): URL to fetch
+            run (_ResearchRun): State of the research run, whose hedge_after gives
+                the seconds to wait before hedging (None to fetch without hedging)
+
+        Both downloads stop once the run is cancelled, and the slower one as
+        soon as the other has succeeded.
+
         Returns:
-            Dict: Research results including summaries and citations
+            Optional[Dict[str, str]]: The first successful result of either request
         """
+        hedge_after = run.hedge_after
+        if not hedge_after:
+            return self.content_retriever.fetch_content(url, should_stop=run.cancelled.is_set)
+
+        race_won = threading.Event()
+
+        def should_stop() -> bool:
+            return run.cancelled.is_set() or race_won.is_set()
+
+        primary = self._hedge_executor.submit(tracing.bind(self.content_retriever.fetch_content), url, should_stop)
         try:
+            return primary.result(timeout=hedge_after)
+        except FuturesTimeout:
+            pass
+
+        self.log_step("hedged_fetch", {"url": url}, run)
+        backup = self._hedge_executor.submit(tracing.bind(self.content_retriever.fetch_content), url, should_stop)
+        done, _ = wait([primary, backup], return_when=FIRST_COMPLETED)
+        first = done.pop()
+        other = backup if first is primary else primary
+        content = first.result()
+        if content is None:
+            # The faster request failed; the other one may still succeed
+            return other.result()
+        race_won.set()
+        other.cancel()
+        return content
+
+    def _process_result(self, result: Dict, sub_q: str, index: int, run: "_ResearchRun") -> Optional[Dict]:
+        """
+        Fetch, extract and summarize a single search result
+
+        Args:
+            result (Dict): Search result with title, link, and snippet
+            sub_q (str): Sub-question the result was found for
+            index (int): Position of the result in the run, used to tag events
+            run (_ResearchRun): State of the research run the result belongs to
+
+        Returns:
+            Optional[Dict]: Summary and source entry, or None if the page yielded nothing
+        """
+        with tracing.use(run.tracer):
+            return self._process_traced_result(result, sub_q, index, run)
+
+    def _process_traced_result(self, result: Dict, sub_q: str, index: int, run: "_ResearchRun") -> Optional[Dict]:
+        """Body of _process_result, run with the run's tracer active"""
+        content = None
+        if result.get("indexed"):
+            if run.enough_sources.is_set():
+                run.drop(result["link"], "enough_sources")
+                return None
+            # Read from the local index; None if the page was evicted since the lookup
+            with tracing.span("index_lookup", url=result["link"]):
+                content = self.corpus_index.get(result["link"])
+
+        if content is None:
+            with self.fetch_semaphore:
+                if run.enough_sources.is_set():
+                    run.drop(result["link"], "enough_sources")
+                    return None
+                if run.cancelled.is_set():
+                    return None
+                with tracing.span("fetch", url=result["link"]):
+                    content = self._fetch(result["link"], run)
+            if content:
+                self._index_page(content)
+
+        run.events.put(SourceFetched(
+            index=index,
+            url=result["link"],
+            title=content["title"] if content else "",
+            success=bool(content)
+        ))
+
+        if not content:
+            return None
+
+        # Skip the LLM call entirely for mirrors of a page we already have
+        kept = run.duplicates.check_content(result["link"], content["content"])
+        if kept is not None:
+            self.log_step("content_processing", {
+                "url": result["link"],
+                "success": False,
+                "duplicate_of": kept
+            }, run)
+            return None
+
+        if not run.accept_source(index):
+            run.drop(result["link"], "enough_sources")
+            return None
+
+        # Only send the passages relevant to the sub-question to the LLM
+        text = content["content"]
+        passages = None
+        if PASSAGE_FILTER_ENABLED and estimate_tokens(text) > PASSAGE_BUDGET_TOKENS:
+            text, passages = self.passage_ranker.select(text, sub_q, PASSAGE_BUDGET_TOKENS)
+
+        on_partial = None
+        if STREAM_SUMMARIES:
+            def on_partial(partial: Dict):
+                run.events.put(SummaryPartial(index=index, url=result["link"], partial=partial))
+
+        # The run may have ended while this page was downloading; its result
+        # would be thrown away, so don't spend an LLM call on it
+        if run.cancelled.is_set() or run.out_of_time():
+            run.drop(result["link"], "deadline")
+            return None
+
+        with tracing.span("summarize", url=result["link"]) as span:
+            summary = self.summarizer.summarize(
+                text,
+                context=sub_q,
+                on_partial=on_partial,
+                deadline=run.deadline
+            )
+            span.attributes["tokens_sent"] = summary.get("tokens_sent", 0) if summary else 0
+
+        self.log_step("content_processing", {
+            "url": result["link"],
+            "success": bool(summary)
+        }, run)
+
+        if not summary:
+            return None
+
+        source = {
+            "title": content["title"],
+            "url": content["url"]
+        }
+        if passages is not None:
+            # Offsets into the extracted text, so quotes can be traced back
+            source["passages"] = passages
+        if result.get("indexed"):
+            source["from_index"] = True
+        run.events.put(SummaryReady(index=index, source=source, summary=summary))
+
+        return {
+            "summary": summary,
+            "source": source,
+            "link": result["link"]
+        }
+
+    def _process_results_iter(
+        self,
+        tasks: List[Tuple[Dict, str]],
+        processed: List[Dict],
+        run: "_ResearchRun"
+    ) -> Iterator[ResearchEvent]:
+        """
+        Run the fetch -> extract -> summarize stage for all search results concurrently
+
+        Progress events are yielded as workers produce them. Once all work has
+        finished, the deadline has passed, or the run has collected its target
+        number of sources, the processed results are appended to `processed`
+        in the same order as tasks.
+
+        Args:
+            tasks (List[Tuple[Dict, str]]): Search results to process, each with
+                the sub-question it was found for
+            processed (List[Dict]): Output list for the ordered results
+            run (_ResearchRun): State of the research run
+        """
+        if not tasks:
+            return
+
+        search_results = [result for result, _ in tasks]
+        workers = min(len(tasks), MAX_FETCH_WORKERS + MAX_LLM_WORKERS)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research")
+        try:
+            futures = []
+            for i, (result, sub_q) in enumerate(tasks):
+                future = executor.submit(self._process_result, result, sub_q, i, run)
+                future.add_done_callback(functools.partial(self._task_done, run, i))
+                futures.append(future)
+
+            remaining_tasks = len(futures)
+            while remaining_tasks:
+                # With enough sources, only the accepted ones are worth waiting for;
+                # they are counted until their futures are done, so none is cut off below
+                if run.enough_sources.is_set() and run.sources_in_progress() == 0:
+                    break
+                timeout = run.deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = run.events.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if event is _TASK_DONE:
+                    remaining_tasks -= 1
+                else:
+                    yield event
+
+            # Drain events of workers that finished together with the last one we waited for
+            while True:
+                try:
+                    event = run.events.get_nowait()
+                except queue.Empty:
+                    break
+                if event is not _TASK_DONE:
+                    yield event
+
+            out_of_time = run.out_of_time()
+            for result, future in zip(search_results, futures):
+                if not future.done():
+                    future.cancel()
+                    reason = "deadline" if out_of_time else "enough_sources"
+                    run.drop(result["link"], reason)
+                    self.log_step("content_processing", {
+                        "url": result["link"],
+                        "success": False,
+                        "error": "time budget exceeded" if out_of_time else "enough sources collected"
+                    }, run)
+                    continue
+                try:
+                    item = future.result()
+                except Exception as e:
+                    self.log_step("content_processing", {
+                        "url": result["link"],
+                        "success": False,
+                        "error": str(e)
+                    }, run)
+                    continue
+                if item:
+                    processed.append(item)
+        finally:
+            # Don't block on stragglers that overran the budget, and have the ones
+            # already running stop downloading and skip their LLM calls
+            run.cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _task_done(run: "_ResearchRun", index: int, future):
+        """Done callback of a worker: release its source slot, then wake the event loop"""
+        run.source_finished(index)
+        run.events.put(_TASK_DONE)
+
+    def research_iter(
+        self,
+        question: str,
+        time_budget: Optional[float] = None,
+        target_sources: Optional[int] = None
+    ) -> Iterator[ResearchEvent]:
+        """
+        Conduct research on a given question, yielding progress events as they happen
+
+        The question is broken into sub-questions that are searched in
+        parallel. They split the sources between them, with only as many
+        sub-questions as can get MIN_SOURCES_PER_SUB_QUESTION each, and a
+        page found by several sub-questions is fetched and summarized once.
+
+        Pages read by earlier runs are kept in a local corpus index. A
+        sub-question that enough indexed pages cover is answered from them
+        without searching the web; otherwise the web results fill the
+        remaining slots.
+
+        Passing time_budget or target_sources switches to deadline mode: more
+        candidates than needed are searched for, slow downloads are hedged,
+        remaining work is cancelled once target_sources sources have been
+        extracted, and part of the budget is kept for cross-validation.
+        Sources dropped for time are listed in the report.
+
+        Args:
+            question (str): The research question
+            time_budget (Optional[float]): Total latency budget in seconds
+            target_sources (Optional[int]): Number of good sources wanted
+
+        Yields:
+            ResearchEvent: Progress events, ending with a ResearchCompleted
+            that carries the same report research() returns
+        """
+        run = None
+        try:
+            started = time.monotonic()
+            deadline_mode = time_budget is not None or target_sources is not None
+            budget = time_budget if time_budget is not None else RESEARCH_TIME_BUDGET
+            # Cross-validation may use the reserve, but not run past the whole budget
+            final_deadline = started + budget if time_budget is not None else None
+            if deadline_mode:
+                budget *= 1 - CROSS_VALIDATION_RESERVE
+            if target_sources is not None:
+                max_results = min(MAX_SEARCH_CANDIDATES, math.ceil(target_sources * OVERPROVISION_FACTOR))
+            else:
+                max_results = MAX_SEARCH_RESULTS
+            run = _ResearchRun(
+                run_id=next(self._run_ids),
+                deadline=started + budget,
+                target_sources=target_sources,
+                hedge_after=HEDGE_AFTER if deadline_mode else None
+            )
+
             # Step 1: Break down the question
-            sub_questions = self.break_down_question(question)
-            self.log_step("question_breakdown", {"sub_questions": sub_questions})
+            with tracing.use(run.tracer), tracing.span("decompose"):
+                sub_questions = self.break_down_question(
+                    question,
+                    max(1, min(MAX_SUB_QUESTIONS, max_results // MIN_SOURCES_PER_SUB_QUESTION))
+                )
+            self.log_step("question_breakdown", {"sub_questions": sub_questions}, run)
 
-            all_summaries = []
-            all_sources = []
+            # Step 2: Use pages read by earlier runs, and search the web at once for
+            # every sub-question they don't cover with its full share of sources
+            # Sub-questions split max_results between them, the first ones taking the remainder
+            shares = [
+                max_results // len(sub_questions) + (1 if i < max_results % len(sub_questions) else 0)
+                for i in range(len(sub_questions))
+            ]
+            # Enough candidates that overlapping sub-questions can each get their own pages
+            local_results = self._search_local(sub_questions, max_results, run)
+            selections = [
+                self._select_results(local, [], share, sub_q, run)
+                for sub_q, local, share in zip(sub_questions, local_results, shares)
+            ]
+            to_search = [
+                sub_q for sub_q, selected, share in zip(sub_questions, selections, shares)
+                if len(selected) < share
+            ]
+            web_results = dict(zip(to_search, self._search_all(to_search, run))) if to_search else {}
 
-            # Step 2: Research each sub-question
-            for sub_q in sub_questions:
-                # Search for relevant content
-                search_results = self.search_tool.search(sub_q)
+            tasks = []
+            for sub_q, local, selected, share in zip(sub_questions, local_results, selections, shares):
+                # The web fills the slots indexed pages left
+                search_results = web_results.get(sub_q, [])
+                self._select_results(search_results, selected, share, sub_q, run)
                 self.log_step("search", {
                     "sub_question": sub_q,
-                    "num_results": len(search_results)
-                })
-
-                # Fetch and process content for each search result
-                for result in search_results:
-                    content = self.content_retriever.fetch_content(result["link"])
-                    
-                    if content:
-                        # Generate summary
-                        summary = self.summarizer.summarize(
-                            content["content"],
-                            context=sub_q
-                        )
-                        
-                        if summary:
-                            all_summaries.append(summary)
-                            all_sources.append({
-                                "title": content["title"],
-                                "url": content["url"]
-                            })
-
-                        self.log_step("content_processing", {
-                            "url": result["link"],
-                            "success": bool(summary)
-                        })
-
-            # Step 3: Cross-validate information
+                    "num_results": len(local) + len(search_results),
+                    "local_results": len(local),
+                    "web_search": sub_q in web_results,
+                    "selected": len(selected)
+                }, run)
+                yield SearchCompleted(sub_question=sub_q, results=selected)
+                tasks.extend((result, sub_q) for result in selected)
+
+            # Step 3: Fetch and process content for all selected results in parallel
+            processed = []
+            yield from self._process_results_iter(tasks, processed, run)
+
+            all_summaries = [item["summary"] for item in processed]
+            all_sources = [item["source"] for item in processed]
+            for source, item in zip(all_sources, processed):
+                # Mirrors collapsed into this source are cited alongside it
+                also_at = run.duplicates.merged_into(item["link"])
+                if also_at:
+                    source["also_at"] = also_at
+
+            # Step 4: Cross-validate information
             if len(all_summaries) > 1:
-                cross_validation = self.summarizer.cross_validate(all_summaries)
+                with tracing.use(run.tracer), tracing.span("cross_validate", sources=len(all_summaries)):
+                    cross_validation = self.summarizer.cross_validate(all_summaries, deadline=final_deadline)
             else:
                 cross_validation = {"cross_validation": "Not enough sources for cross-validation"}
+            yield CrossValidationReady(cross_validation=cross_validation)
 
-            # Step 4: Compile final report
+            # Step 5: Compile final report
             report = {
                 "question": question,
+                "sub_questions": sub_questions,
                 "summaries": all_summaries,
                 "sources": all_sources,
+                "dropped_sources": run.dropped,
                 "cross_validation": cross_validation,
-                "research_log": self.research_log
+                "research_log": run.log.to_dicts(),
+                "timings": run.tracer.to_dicts()
             }
 
-            return report
+            yield ResearchCompleted(report=report)
 
         except Exception as e:
             error_report = {
                 "error": str(e),
-                "research_log": self.research_log
+                "research_log": run.log.to_dicts() if run is not None else []
             }
-            return error_report
+            yield ResearchCompleted(report=error_report)
+
+    def research(
+        self,
+        question: str,
+        time_budget: Optional[float] = None,
+        target_sources: Optional[int] = None
+    ) -> Dict:
+        """
+        Conduct research on a given question
+
+        Args:
+            question (str): The research question
+            time_budget (Optional[float]): Total latency budget in seconds (deadline mode)
+            target_sources (Optional[int]): Number of good sources wanted (deadline mode)
+
+        Returns:
+            Dict: Research results including summaries and citations
+        """
+        report = None
+        for event in self.research_iter(question, time_budget=time_budget, target_sources=target_sources):
+            if isinstance(event, ResearchCompleted):
+                report = event.report
+        return report
+
+    def get_research_log(self, run_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Return logged steps of recent research runs, oldest first
+
+        Only the most recent RESEARCH_HISTORY_MAX_ENTRIES steps are kept.
+
+        Args:
+            run_id (Optional[int]): Only return the steps of this run
+            limit (Optional[int]): Only return the most recent `limit` steps
+
+        Returns:
+            List[Dict]: Steps with timestamp, run_id, step and details
+        """
+        return self.research_history.to_dicts(run_id=run_id, limit=limit)
+
+    def clear_research_log(self):
+        """Forget the steps of all earlier runs"""
+        self.research_history.clear()
+
+
+class _ResearchRun:
+    """State shared by the workers of a single research_iter() call"""
+
+    def __init__(
+        self,
+        run_id: int,
+        deadline: float,
+        target_sources: Optional[int] = None,
+        hedge_after: Optional[float] = None
+    ):
+        self.run_id = run_id
+        self.log = ResearchLog(RESEARCH_LOG_MAX_ENTRIES)
+        self.deadline = deadline
+        self.target_sources = target_sources
+        self.hedge_after = hedge_after
+        self.events = queue.Queue()
+        self.tracer = tracing.Tracer()
+        self.duplicates = DuplicateDetector()
+        self.enough_sources = threading.Event()
+        # Set when the fetch/summarize stage is over; workers still running stop early
+        self.cancelled = threading.Event()
+        self.dropped: List[Dict] = []
+        self._accepted = 0
+        self._in_progress: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def accept_source(self, index: int) -> bool:
+        """Claim a slot for the extracted source of task `index`; False once the target has been reached"""
+        with self._lock:
+            if self.target_sources is not None and self._accepted >= self.target_sources:
+                return False
+            self._accepted += 1
+            self._in_progress.add(index)
+            if self.target_sources is not None and self._accepted >= self.target_sources:
+                self.enough_sources.set()
+            return True
+
+    def source_finished(self, index: int):
+        """Mark the task `index` as finished; releases its slot if it held an accepted source"""
+        with self._lock:
+            self._in_progress.discard(index)
+
+    def out_of_time(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def sources_in_progress(self) -> int:
+        with self._lock:
+            return len(self._in_progress)
 
-    def get_research_log(self) -> List[Dict]:
-        """Return the research log"""
-        return self.research_log 
\ No newline at end of file
+    def drop(self, url: str, reason: str):
+        """Record a source that was abandoned, and why"""
+        with self._lock:
+            if all(d["url"] != url for d in self.dropped):
+                self.dropped.append({"url": url, "reason": reason})
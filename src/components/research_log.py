@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class LogRecord:
+    """One step of a research run"""
+    __slots__ = ("timestamp", "run_id", "step", "details")
+
+    def __init__(self, timestamp: float, run_id: int, step: str, details: Dict):
+        self.timestamp = timestamp
+        self.run_id = run_id
+        self.step = step
+        self.details = details
+
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.timestamp)),
+            "run_id": self.run_id,
+            "step": self.step,
+            "details": self.details
+        }
+
+
+class ResearchLog:
+    """
+    Bounded, thread-safe log of research steps
+
+    Records are kept in a ring buffer: once max_entries is reached, each new
+    record evicts the oldest one.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.dropped = 0
+        self._records = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def append(self, record: LogRecord):
+        with self._lock:
+            if len(self._records) == self.max_entries:
+                self.dropped += 1
+            self._records.append(record)
+
+    def records(self, run_id: Optional[int] = None, limit: Optional[int] = None) -> List[LogRecord]:
+        """
+        Return logged records, oldest first
+
+        Args:
+            run_id (Optional[int]): Only return the records of this run
+            limit (Optional[int]): Only return the most recent `limit` records
+
+        Returns:
+            List[LogRecord]: Matching records
+        """
+        with self._lock:
+            records = list(self._records)
+        if run_id is not None:
+            records = [record for record in records if record.run_id == run_id]
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return records
+
+    def to_dicts(self, run_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        return [record.to_dict() for record in self.records(run_id, limit)]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self.dropped = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
@@ -8,19 +8,101 @@ load_dotenv()
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
 # Search Settings
-MAX_SEARCH_RESULTS = 5
+SEARCH_URL = os.getenv("CITESIGHT_SEARCH_URL", "https://html.duckduckgo.com/html/")
+MAX_SEARCH_RESULTS = int(os.getenv("CITESIGHT_MAX_SEARCH_RESULTS", "5"))
+MAX_SEARCH_CANDIDATES = 20  # Results scraped and cached per query, so callers can over-provision
+MAX_SUB_QUESTIONS = 4  # Sub-questions a research question is broken into, each searched in parallel
+DECOMPOSE_WITH_LLM = True  # Ask the LLM for sub-questions; otherwise split on question marks and semicolons
+DECOMPOSE_MIN_WORDS = 8  # Shorter questions are only split on question marks and semicolons, without an LLM call
+MIN_SOURCES_PER_SUB_QUESTION = 2  # Sub-questions share MAX_SEARCH_RESULTS; fewer are used so each gets at least this many
+SEARCH_REQUESTS_PER_MINUTE = float(os.getenv("CITESIGHT_SEARCH_REQUESTS_PER_MINUTE", "30"))  # DuckDuckGo requests across all searches; cached queries don't count
 MAX_RETRIES = 3
-TIMEOUT = 30
+
+# HTTP Transport Settings
+CONNECT_TIMEOUT = 5  # Seconds to establish a TCP/TLS connection
+READ_TIMEOUT = 30  # Seconds to wait for data from a web server
+LLM_READ_TIMEOUT = 180  # Seconds to wait for an OpenRouter completion
+POOL_CONNECTIONS = 20  # Number of per-host connection pools kept alive
+POOL_MAXSIZE = 10  # Concurrent connections per host; further requests wait for one to be returned
+POOL_TIMEOUT = 30  # Seconds a request waits for a free connection to its host before failing
+
+# Concurrency Settings
+MAX_FETCH_WORKERS = int(os.getenv("CITESIGHT_MAX_FETCH_WORKERS", "5"))  # Concurrent page downloads per question
+MAX_LLM_WORKERS = int(os.getenv("CITESIGHT_MAX_LLM_WORKERS", "3"))  # Ceiling for concurrent OpenRouter calls, adapted down when throttled
+EXTRACT_WORKERS = int(os.getenv("CITESIGHT_EXTRACT_WORKERS", str(os.cpu_count() or 1)))  # HTML extraction processes; 0 extracts in the fetching thread
+EXTRACT_CPU_LIMIT = 10.0  # CPU seconds a single page may take to extract before it is given up on
+EXTRACT_TIMEOUT = 60.0  # Wall-clock seconds to wait for a page's extraction, including for a free worker; the stuck pool is then killed
+RESEARCH_TIME_BUDGET = 120  # Wall-clock budget per question, in seconds
+
+# Deadline Mode Settings (research() with time_budget/target_sources)
+OVERPROVISION_FACTOR = 2.0  # Candidates fetched per wanted source
+HEDGE_AFTER = 3.0  # Seconds before a slow page download gets a duplicate request
+CROSS_VALIDATION_RESERVE = 0.2  # Share of the time budget kept for cross-validation
 
 # LLM Settings
 MODEL_NAME = "deepseek/deepseek-r1-0528:free"  # OpenRouter's free Deepseek model
 TEMPERATURE = 0.7
 MAX_TOKENS = 1000
+CHARS_PER_TOKEN = 4  # Rough average used to estimate prompt sizes
+CHUNK_TOKENS = 3000  # Documents longer than this are summarized chunk by chunk
+MAX_DOCUMENT_TOKENS = 12000  # Content tokens sent to the LLM per document; the rest is dropped
+MAX_CHUNK_WORKERS = 3  # Concurrent chunk summaries per long document
+PASSAGE_FILTER_ENABLED = True  # Send only the passages most relevant to the sub-question
+PASSAGE_TOKENS = 200  # Approximate size of a ranked passage window
+PASSAGE_BUDGET_TOKENS = 2500  # Tokens of top-ranked passages sent per document; below CHUNK_TOKENS so they are summarized in one call
+BM25_K1 = 1.5
+BM25_B = 0.75
+CROSS_VALIDATION_FAN_IN = 5  # Sources (or group analyses) compared per cross-validation call
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("CITESIGHT_LLM_REQUESTS_PER_MINUTE", "20"))  # OpenRouter request rate across all calls
+LLM_TOKENS_PER_MINUTE = 200000  # Prompt plus completion tokens per minute across all calls
+LLM_MAX_RETRIES = 4  # Retries for 429, 5xx and connection errors
+LLM_BACKOFF_BASE = 1.0  # Seconds; backoff before retry n is jittered up to BASE * 2**n
+LLM_BACKOFF_MAX = 60.0
+STREAM_SUMMARIES = True  # Stream completions so partial summaries can be shown while generating
+PROMPT_VERSION = "1"  # Bump whenever a prompt template changes to invalidate cached responses
 
 # OpenRouter Settings
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_API_URL = os.getenv("CITESIGHT_OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 SITE_URL = "https://cite-sight.com"  # Replace with your actual site URL
 SITE_NAME = "CiteSight"
 
+# Deduplication Settings
+SIMHASH_MAX_DISTANCE = 3  # Documents whose 64-bit SimHashes differ in at most this many bits are duplicates
+
+# Cache Settings
+CACHE_DIR = os.getenv("CITESIGHT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "cite_sight"))
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_TTL = 24 * 60 * 60  # Seconds before a cached page is revalidated
+PAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Least recently used pages are evicted beyond this
+LLM_CACHE_ENABLED = True
+LLM_CACHE_TTL = 7 * 24 * 60 * 60  # Seconds a cached LLM response stays valid
+LLM_CACHE_MAX_ENTRIES = 10000  # Least recently used responses are evicted beyond this
+LLM_CACHE_BYPASS_SAMPLED = False  # Skip the cache when TEMPERATURE > 0 to always get a fresh sample
+SEARCH_CACHE_ENABLED = True
+SEARCH_CACHE_PERSIST = True  # Also keep search results on disk across restarts
+SEARCH_CACHE_TTL = 6 * 60 * 60  # Seconds search results are reused
+SEARCH_CACHE_MAX_ENTRIES = 1000  # Queries kept in memory
+
+# Local Corpus Index Settings
+CORPUS_INDEX_ENABLED = os.getenv("CITESIGHT_CORPUS_INDEX_ENABLED", "1") != "0"  # Answer from pages fetched earlier before searching the web
+CORPUS_MIN_TERM_MATCH = 0.6  # Share of a sub-question's terms a stored page must contain to cover it
+CORPUS_MIN_SCORE = 2.0  # BM25 score a stored page also needs; pages matching only common words score far lower
+CORPUS_MAX_AGE = 7 * 24 * 60 * 60  # Seconds an indexed page is used before it has to be found on the web again
+CORPUS_MAX_DOCUMENTS = 5000  # Least recently indexed pages are dropped beyond this
+
+# Research Log Settings
+RESEARCH_LOG_MAX_ENTRIES = 500  # Steps kept per question; the oldest are dropped beyond this
+RESEARCH_HISTORY_MAX_ENTRIES = 2000  # Steps of recent questions kept for get_research_log()
+
+# Research Service Settings (python -m src.service)
+SERVICE_URL = os.getenv("CITESIGHT_SERVICE_URL")  # When set, app.py sends questions to this service instead of researching in-process
+SERVICE_HOST = os.getenv("CITESIGHT_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("CITESIGHT_SERVICE_PORT", "8765"))
+SERVICE_MAX_CONCURRENT_QUESTIONS = 4  # Questions researched at once; further ones wait in a queue
+SERVICE_JOB_TTL = 10 * 60  # Seconds a finished question's events and report stay available
+SERVICE_HEARTBEAT = 15  # Seconds between keep-alive lines on an idle event stream
+
 # Web Scraping Settings
-USER_AGENT = "CiteSight Research Agent/1.0" 
\ No newline at end of file
+USER_AGENT = "CiteSight Research Agent/1.0"
+MAX_PAGE_BYTES = 5 * 1024 * 1024  # Downloads stop here; HTML is extracted from what arrived, larger PDFs are skipped
+PDF_EXTRACTION_ENABLED = True  # Extract text from PDFs (requires pypdf) instead of skipping them 
\ No newline at end of file
@@ -0,0 +1,376 @@
+"""
+Long-lived research service
+
+Runs one ResearchAgent for all users, so connections, caches and LLM rate
+limits are shared, and identical questions asked while one is already being
+researched are answered by that same run.
+
+    python -m src.service --port 8765
+
+API:
+    POST /research                 {"question", "time_budget"?, "target_sources"?} -> {"job_id", "coalesced"}
+    GET  /research/<job_id>        {"status", "question", "report"?}
+    GET  /research/<job_id>/events progress events as NDJSON, ending with ResearchCompleted
+    GET  /stats                    queue, coalescing, cache and rate-limiter counters
+    GET  /health
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.components.events import ResearchEvent, ResearchCompleted, event_to_dict, event_from_dict
+from src.components.research_agent import ResearchAgent
+from src.tools.http_client import HttpClient
+from src.tools.search_cache import normalize_query
+from src.config.config import (
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_MAX_CONCURRENT_QUESTIONS,
+    SERVICE_JOB_TTL,
+    SERVICE_HEARTBEAT,
+    LLM_READ_TIMEOUT
+)
+
+
+class _Job:
+    """A question being researched, with the events it has produced so far"""
+
+    def __init__(self, key: tuple, question: str, time_budget: Optional[float], target_sources: Optional[int]):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.question = question
+        self.time_budget = time_budget
+        self.target_sources = target_sources
+        self.status = "queued"
+        self.events: List[Dict] = []
+        self.report: Optional[Dict] = None
+        self.finished_at: Optional[float] = None
+        # Latest SummaryPartial per source, as (sequence number, event); only followed live
+        self.partials: Dict[int, Tuple[int, Dict]] = {}
+        self._partial_seq = 0
+        self._cond = threading.Condition()
+
+    def publish(self, event: Dict):
+        with self._cond:
+            if event["type"] == "SummaryPartial":
+                # Each partial holds everything parsed so far, so it replaces the previous one
+                self._partial_seq += 1
+                self.partials[event["index"]] = (self._partial_seq, event)
+            else:
+                self.events.append(event)
+                if event["type"] == "SummaryReady":
+                    self.partials.pop(event["index"], None)
+                elif event["type"] == "ResearchCompleted":
+                    self.partials.clear()
+            self._cond.notify_all()
+
+    def finish(self, report: Dict):
+        with self._cond:
+            self.report = report
+            self.status = "done"
+            self.finished_at = time.monotonic()
+            self._cond.notify_all()
+
+    def stream(self, heartbeat: float) -> Iterator[Optional[Dict]]:
+        """
+        Replay the job's events, then follow new ones until it finishes
+
+        Partial summaries are not replayed; a stream gets the latest partial
+        of each source still being summarized and those that follow. Yields
+        None after `heartbeat` seconds without an event, so callers can keep
+        an idle connection alive.
+        """
+        index = 0
+        partial_seq = 0
+        while True:
+            with self._cond:
+                if index >= len(self.events) and self._partial_seq == partial_seq and self.status != "done":
+                    self._cond.wait(timeout=heartbeat)
+                pending = self.events[index:]
+                partials = sorted(entry for entry in self.partials.values() if entry[0] > partial_seq)
+                partial_seq = self._partial_seq
+                finished = self.status == "done"
+            index += len(pending)
+            pending += [event for _, event in partials]
+            if pending:
+                yield from pending
+            elif finished:
+                return
+            else:
+                yield None
+
+
+class ResearchService:
+    """
+    Shares one ResearchAgent between all clients
+
+    The agent's fetch semaphore and LLM scheduler then limit downloads and
+    OpenRouter calls across all users, and at most max_concurrent questions
+    are researched at once.
+    """
+
+    def __init__(
+        self,
+        agent: Optional[ResearchAgent] = None,
+        max_concurrent: int = SERVICE_MAX_CONCURRENT_QUESTIONS,
+        job_ttl: float = SERVICE_JOB_TTL
+    ):
+        self.agent = agent or ResearchAgent()
+        self.job_ttl = job_ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="question")
+        self.jobs: Dict[str, _Job] = {}
+        self.submitted = 0
+        self.coalesced = 0
+        self._in_flight: Dict[tuple, _Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, question: str, time_budget: Optional[float] = None, target_sources: Optional[int] = None):
+        """
+        Start researching a question, or join the run already researching it
+
+        Returns:
+            Tuple[_Job, bool]: The job and whether it was already in flight
+        """
+        key = (normalize_query(question), time_budget, target_sources)
+        with self._lock:
+            self._purge_locked()
+            job = self._in_flight.get(key)
+            if job is not None:
+                self.coalesced += 1
+                return job, True
+            job = _Job(key, question, time_budget, target_sources)
+            self.jobs[job.id] = job
+            self._in_flight[key] = job
+            self.submitted += 1
+        self.executor.submit(self._run, job)
+        return job, False
+
+    def close(self):
+        """Stop taking questions, wait for the running ones and close the agent"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.agent.close()
+
+    def _run(self, job: _Job):
+        job.status = "running"
+        report = None
+        try:
+            for event in self.agent.research_iter(
+                job.question,
+                time_budget=job.time_budget,
+                target_sources=job.target_sources
+            ):
+                job.publish(event_to_dict(event))
+                if isinstance(event, ResearchCompleted):
+                    report = event.report
+        except Exception as e:
+            print(f"Error researching {job.question!r}: {str(e)}")
+            report = {"error": str(e), "research_log": []}
+            job.publish(event_to_dict(ResearchCompleted(report=report)))
+        finally:
+            with self._lock:
+                # Later askers start a fresh run that can pick up newer results
+                self._in_flight.pop(job.key, None)
+            job.finish(report)
+
+    def _purge_locked(self):
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.job_ttl
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[_Job]:
+        with self._lock:
+            self._purge_locked()
+            return self.jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._purge_locked()
+            statuses = [job.status for job in self.jobs.values()]
+            stats = {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "queued": statuses.count("queued"),
+                "running": statuses.count("running"),
+                "done": statuses.count("done")
+            }
+        agent = self.agent
+        stats["llm"] = agent.llm_scheduler.stats()
+        caches = (
+            ("search_cache", agent.search_cache),
+            ("page_cache", agent.page_cache),
+            ("llm_cache", agent.llm_cache),
+            ("corpus_index", agent.corpus_index)
+        )
+        for name, cache in caches:
+            if cache is not None:
+                stats[name] = cache.stats()
+        return stats
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    service: ResearchService = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: Dict):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/research":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("expected a JSON object")
+            question = str(payload.get("question", "")).strip()
+            time_budget = payload.get("time_budget")
+            target_sources = payload.get("target_sources")
+            time_budget = float(time_budget) if time_budget is not None else None
+            target_sources = int(target_sources) if target_sources is not None else None
+        except (TypeError, ValueError) as e:
+            self._send_json(400, {"error": f"invalid request: {str(e)}"})
+            return
+        if not question:
+            self._send_json(400, {"error": "question is required"})
+            return
+
+        job, coalesced = self.service.submit(question, time_budget, target_sources)
+        self._send_json(202, {"job_id": job.id, "coalesced": coalesced})
+
+    def do_GET(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok"})
+        elif parts == ["stats"]:
+            self._send_json(200, self.service.stats())
+        elif len(parts) in (2, 3) and parts[0] == "research":
+            job = self.service.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": "unknown job"})
+            elif len(parts) == 2:
+                self._send_json(200, {"status": job.status, "question": job.question, "report": job.report})
+            elif parts[2] == "events":
+                self._stream_events(job)
+            else:
+                self._send_json(404, {"error": "not found"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _stream_events(self, job: _Job):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for event in job.stream(SERVICE_HEARTBEAT):
+                # Blank lines keep idle connections from timing out
+                line = json.dumps(event) + "\n" if event is not None else "\n"
+                self.wfile.write(line.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; the research itself carries on for others
+            pass
+        self.close_connection = True
+
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT, service: Optional[ResearchService] = None) -> ThreadingHTTPServer:
+    """Create the HTTP server for a research service (call serve_forever() to run it)"""
+    handler = type("ServiceHandler", (_ServiceHandler,), {"service": service or ResearchService()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class ResearchClient:
+    """
+    Talks to a research service with the same interface as ResearchAgent
+
+    research_iter() yields the service's events as they arrive, so callers
+    can use either one.
+    """
+
+    def __init__(self, base_url: str, http: Optional[HttpClient] = None):
+        self.base_url = base_url.rstrip("/")
+        # Idle event streams carry a heartbeat, so the normal read timeout applies
+        self.http = http or HttpClient(read_timeout=max(LLM_READ_TIMEOUT, 2 * SERVICE_HEARTBEAT))
+
+    def submit(self, question: str, time_budget: Optional[float] = None, target_sources: Optional[int] = None) -> Dict:
+        response = self.http.post(
+            f"{self.base_url}/research",
+            json={"question": question, "time_budget": time_budget, "target_sources": target_sources}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def research_iter(
+        self,
+        question: str,
+        time_budget: Optional[float] = None,
+        target_sources: Optional[int] = None
+    ) -> Iterator[ResearchEvent]:
+        """Submit a question and yield its progress events, ending with ResearchCompleted"""
+        job = self.submit(question, time_budget, target_sources)
+        response = self.http.get(f"{self.base_url}/research/{job['job_id']}/events", stream=True)
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    event = event_from_dict(json.loads(line))
+                    yield event
+                    if isinstance(event, ResearchCompleted):
+                        return
+        finally:
+            response.close()
+        yield ResearchCompleted(report={"error": "Research service closed the event stream early", "research_log": []})
+
+    def research(self, question: str, time_budget: Optional[float] = None, target_sources: Optional[int] = None) -> Dict:
+        report = None
+        for event in self.research_iter(question, time_budget=time_budget, target_sources=target_sources):
+            if isinstance(event, ResearchCompleted):
+                report = event.report
+        return report
+
+    def stats(self) -> Dict:
+        response = self.http.get(f"{self.base_url}/stats")
+        response.raise_for_status()
+        return response.json()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the CiteSight research service")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    args = parser.parse_args(argv)
+
+    service = ResearchService()
+    server = serve(args.host, args.port, service)
+    print(f"CiteSight research service listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,97 @@
-import trafilatura
 import requests
-from typing import Optional, Dict
-from src.config.config import USER_AGENT, TIMEOUT
+from typing import Callable, Optional, Dict
+from src.config.config import USER_AGENT, MAX_PAGE_BYTES, PDF_EXTRACTION_ENABLED
+from src.tools.http_client import HttpClient
+from src.tools.page_cache import PageCache
+from src.tools.extractor import Extractor, PDF_SUPPORTED
+from src.tools import tracing
+
+# Media types trafilatura can extract from
+HTML_TYPES = {"text/html", "application/xhtml+xml", "application/xml", "text/xml", "text/plain"}
+PDF_TYPES = {"application/pdf", "application/x-pdf"}
+
 
 class ContentRetriever:
-    def __init__(self):
+    def __init__(
+        self,
+        http: Optional[HttpClient] = None,
+        cache: Optional[PageCache] = None,
+        extractor: Optional[Extractor] = None,
+        max_bytes: int = MAX_PAGE_BYTES
+    ):
+        self.http = http or HttpClient()
+        self.cache = cache
+        self.extractor = extractor or Extractor()
+        self.max_bytes = max_bytes
+        self.accept_pdf = PDF_EXTRACTION_ENABLED and PDF_SUPPORTED
         self.headers = {
             'User-Agent': USER_AGENT
         }
 
-    def fetch_content(self, url: str) -> Optional[Dict[str, str]]:
+    def fetch_content(self, url: str, should_stop: Optional[Callable[[], bool]] = None) -> Optional[Dict[str, str]]:
         """
         Fetch and extract content from a URL
         
         Args:
             url (str): URL to fetch content from
+            should_stop (Optional[Callable[[], bool]]): Checked while the body
+                downloads; once it returns True the download is abandoned
             
         Returns:
             Optional[Dict[str, str]]: Dictionary containing title and text content
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=TIMEOUT)
-            response.raise_for_status()
+            cached = self.cache.get(url) if self.cache else None
+            if cached and cached["fresh"]:
+                tracing.increment("cache_hits")
+                return self._from_cache(cached, url)
             
-            downloaded = trafilatura.fetch_url(url)
+            headers = dict(self.headers)
+            if cached:
+                # Revalidate the stale copy instead of downloading it again
+                if cached["etag"]:
+                    headers['If-None-Match'] = cached["etag"]
+                if cached["last_modified"]:
+                    headers['If-Modified-Since'] = cached["last_modified"]
+            
+            # Streamed, so the headers can be checked before any of the body is read
+            with self.http.get(url, headers=headers, stream=True) as response:
+                if cached and response.status_code == 304:
+                    tracing.increment("cache_hits")
+                    self.cache.mark_revalidated(url)
+                    return self._from_cache(cached, url)
+                
+                response.raise_for_status()
+                
+                is_pdf = self._check_headers(url, response)
+                if is_pdf is None:
+                    if self.cache:
+                        # Remembered as empty so the page isn't requested again until it expires
+                        self.cache.put(url, b"", "", "")
+                    return None
+                
+                # Hand the raw bytes to the extractor so the page is only downloaded once;
+                # trafilatura detects the encoding itself
+                downloaded = self._read_body(url, response, allow_truncated=not is_pdf, should_stop=should_stop)
             
-            if downloaded is None:
+            if not downloaded or (should_stop is not None and should_stop()):
                 return None
             
-            # Extract the main content
-            text = trafilatura.extract(downloaded)
+            # Text and title come from a single parse in an extraction worker process
+            extracted = self.extractor.extract(downloaded, url, pdf=is_pdf)
+            text = extracted["content"] if extracted else ""
+            title = extracted["title"] if extracted else ""
             
-            # Extract metadata
-            metadata = trafilatura.extract_metadata(downloaded)
-            title = metadata.title if metadata else ""
+            if self.cache:
+                # Pages without extractable text are cached too, so they aren't re-fetched
+                self.cache.put(
+                    url,
+                    downloaded,
+                    title or "",
+                    text or "",
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
             
             if not text:
                 return None
@@ -46,4 +104,67 @@ class ContentRetriever:
             
         except Exception as e:
             print(f"Error fetching content from {url}: {str(e)}")
-            return None 
\ No newline at end of file
+            return None 
+
+    def _check_headers(self, url: str, response: requests.Response) -> Optional[bool]:
+        """
+        Decide from the response headers whether a page is worth downloading
+
+        Returns:
+            Optional[bool]: True for a PDF, False for HTML, None to skip the page
+        """
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        is_pdf = content_type in PDF_TYPES
+        if is_pdf and not self.accept_pdf:
+            print(f"Skipping {url}: PDF extraction is not available")
+            return None
+        # Servers that send no type are usually serving HTML
+        if content_type and not is_pdf and content_type not in HTML_TYPES:
+            print(f"Skipping {url}: unsupported content type {content_type}")
+            return None
+        
+        length = response.headers.get("Content-Length", "")
+        # A truncated PDF can't be parsed, so there is no point starting on one that's too big
+        if is_pdf and length.isdigit() and int(length) > self.max_bytes:
+            print(f"Skipping {url}: {length} bytes exceeds the {self.max_bytes} byte limit")
+            return None
+        return is_pdf
+
+    def _read_body(
+        self,
+        url: str,
+        response: requests.Response,
+        allow_truncated: bool,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Optional[bytes]:
+        """Read a streamed body, stopping once max_bytes have arrived or should_stop() is true"""
+        chunks = []
+        size = 0
+        truncated = False
+        # iter_content decompresses, so this also bounds gzip bombs
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if should_stop is not None and should_stop():
+                # Nobody is waiting for this page any more; don't cache a partial body
+                tracing.increment("bytes", size)
+                return None
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                truncated = True
+                break
+        tracing.increment("bytes", size)
+        if truncated and not allow_truncated:
+            print(f"Skipping {url}: body exceeds the {self.max_bytes} byte limit")
+            return None
+        # Truncated HTML still parses, and the main content almost always comes first
+        return b"".join(chunks)[:self.max_bytes]
+
+    def _from_cache(self, cached: Dict, url: str) -> Optional[Dict[str, str]]:
+        """Build a fetch_content result from a cache entry without re-extracting"""
+        if not cached["content"]:
+            return None
+        return {
+            "title": cached["title"],
+            "content": cached["content"],
+            "url": url
+        }
\ No newline at end of file
@@ -0,0 +1,252 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+from src.tools.passage_ranker import tokenize
+from src.config.config import (
+    CACHE_DIR,
+    BM25_K1,
+    BM25_B,
+    CORPUS_MIN_TERM_MATCH,
+    CORPUS_MIN_SCORE,
+    CORPUS_MAX_AGE,
+    CORPUS_MAX_DOCUMENTS
+)
+
+
+class CorpusIndex:
+    """
+    Persistent full-text index of the pages fetched by earlier research runs
+
+    Extracted pages are stored zlib-compressed in SQLite next to an inverted
+    index of their terms (one postings row per term and page), so follow-up
+    questions can be answered from pages already read instead of searching
+    and downloading them again. Pages are ranked with BM25, using the same
+    tokenizer as the passage ranker. Their summaries are not stored here; the
+    LLM response cache already reuses them.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        min_term_match: float = CORPUS_MIN_TERM_MATCH,
+        min_score: float = CORPUS_MIN_SCORE,
+        max_age: float = CORPUS_MAX_AGE,
+        max_documents: int = CORPUS_MAX_DOCUMENTS,
+        k1: float = BM25_K1,
+        b: float = BM25_B
+    ):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "corpus.sqlite3")
+        self.min_term_match = min_term_match
+        self.min_score = min_score
+        self.max_age = max_age
+        self.max_documents = max_documents
+        self.k1 = k1
+        self.b = b
+        self.queries = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT UNIQUE,
+                    title TEXT,
+                    content BLOB,
+                    checksum TEXT,
+                    length INTEGER,
+                    indexed_at REAL
+                )
+            """)
+            # Clustered on (term, doc_id), so a term's postings are one range scan
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT,
+                    doc_id INTEGER,
+                    tf INTEGER,
+                    PRIMARY KEY (term, doc_id)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS postings_doc_id ON postings (doc_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS documents_indexed_at ON documents (indexed_at)")
+
+    def add(self, url: str, title: str, content: str):
+        """
+        Index an extracted page, replacing an earlier version of it
+
+        Re-adding unchanged content only marks the page as fresh again, so
+        its postings are kept.
+        """
+        if not content:
+            return
+        checksum = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if self._refresh(url, title, checksum):
+            return
+        # Tokenize outside the lock; it is the expensive part
+        terms = Counter(tokenize(f"{title}\n{content}"))
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM documents WHERE url = ?", (url,)).fetchone()
+            if row is not None:
+                self._delete(row[0])
+            doc_id = self._conn.execute(
+                "INSERT INTO documents (url, title, content, checksum, length, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, title, zlib.compress(content.encode("utf-8")), checksum, sum(terms.values()), now)
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?)",
+                ((term, doc_id, tf) for term, tf in terms.items())
+            )
+            self._evict()
+
+    def _refresh(self, url: str, title: str, checksum: str) -> bool:
+        """Mark a page as freshly indexed if its content is unchanged; False if it needs (re)indexing"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id, checksum FROM documents WHERE url = ?", (url,)).fetchone()
+            if row is None or row[1] != checksum:
+                return False
+            self._conn.execute("UPDATE documents SET indexed_at = ?, title = ? WHERE id = ?", (time.time(), title, row[0]))
+            return True
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        """
+        Find the stored pages that cover a query
+
+        A page covers the query when it contains at least min_term_match of
+        the query's distinct terms, scores at least min_score with BM25 and
+        was indexed within max_age. Term overlap alone is easy to reach with
+        common words; their low IDF keeps such pages below min_score.
+        Covering pages are ranked by BM25.
+
+        Args:
+            query (str): Question or sub-question
+            limit (int): Maximum number of pages to return
+
+        Returns:
+            List[Dict]: Pages with url, title, snippet and score, best first
+        """
+        terms = set(tokenize(query))
+        if not terms or limit <= 0:
+            return []
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            self.queries += 1
+            n, avg_length = self._conn.execute(
+                "SELECT COUNT(*), AVG(length) FROM documents"
+            ).fetchone()
+            if not n:
+                return []
+            postings = {
+                term: self._conn.execute("SELECT doc_id, tf FROM postings WHERE term = ?", (term,)).fetchall()
+                for term in terms
+            }
+
+            # Term-at-a-time scoring, as in PassageRanker.score
+            matched = Counter()
+            docs_tf = {}
+            for term, docs in postings.items():
+                for doc_id, tf in docs:
+                    matched[doc_id] += 1
+                    docs_tf.setdefault(doc_id, []).append((term, tf))
+            covering = [doc_id for doc_id, count in matched.items() if count / len(terms) >= self.min_term_match]
+            if not covering:
+                return []
+
+            placeholders = ",".join("?" * len(covering))
+            lengths = dict(self._conn.execute(
+                f"SELECT id, length FROM documents WHERE id IN ({placeholders}) AND indexed_at >= ?",
+                (*covering, cutoff)
+            ).fetchall())
+
+            avg_length = avg_length or 1.0
+            idf = {
+                term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                for term, docs in postings.items()
+            }
+            scores = {}
+            for doc_id, length in lengths.items():
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] = sum(idf[term] * tf * (self.k1 + 1) / (tf + norm) for term, tf in docs_tf[doc_id])
+            best = sorted(
+                (doc_id for doc_id, score in scores.items() if score >= self.min_score),
+                key=scores.get,
+                reverse=True
+            )[:limit]
+
+            # Only the pages returned are decompressed, for their snippets
+            rows = {
+                row[0]: row[1:]
+                for row in self._conn.execute(
+                    f"SELECT id, url, title, content FROM documents WHERE id IN ({','.join('?' * len(best))})",
+                    best
+                ).fetchall()
+            } if best else {}
+
+        results = []
+        for doc_id in best:
+            url, title, content = rows[doc_id]
+            text = zlib.decompress(content).decode("utf-8")
+            results.append({
+                "title": title,
+                "link": url,
+                "snippet": " ".join(text[:300].split()),
+                "score": round(scores[doc_id], 3)
+            })
+        return results
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        """Return a stored page in the same shape as ContentRetriever.fetch_content, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT title, content FROM documents WHERE url = ?", (url,)).fetchone()
+            if row is not None:
+                self.hits += 1
+        if row is None:
+            return None
+        return {
+            "title": row[0],
+            "content": zlib.decompress(row[1]).decode("utf-8"),
+            "url": url
+        }
+
+    def _delete(self, doc_id: int):
+        """Remove a page with its postings (lock held)"""
+        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def _evict(self):
+        """Drop the least recently indexed pages beyond max_documents (lock held)"""
+        excess = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] - self.max_documents
+        if excess <= 0:
+            return
+        for (doc_id,) in self._conn.execute(
+            "SELECT id FROM documents ORDER BY indexed_at LIMIT ?", (excess,)
+        ).fetchall():
+            self._delete(doc_id)
+
+    def stats(self) -> Dict:
+        """Return lookup counters and the size of the index"""
+        with self._lock:
+            documents, content_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(content)), 0) FROM documents"
+            ).fetchone()
+            postings = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+            return {
+                "queries": self.queries,
+                "hits": self.hits,
+                "documents": documents,
+                "postings": postings,
+                "bytes": content_bytes
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
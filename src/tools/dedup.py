@@ -0,0 +1,125 @@
+import hashlib
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from src.config.config import SIMHASH_MAX_DISTANCE
+
+_WORD_RE = re.compile(r"\w+")
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "amp", "outputtype"}
+_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to a canonical form for duplicate detection
+
+    Scheme, host prefixes like www./m./amp., default ports, fragments,
+    tracking parameters, AMP path suffixes and trailing slashes are
+    normalized away and the remaining query parameters are sorted. The
+    result is only used as a key; pages are still fetched from their
+    original URL.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/(amp|amp\.html)/?$", "", parts.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash of a text over word shingles"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class DuplicateDetector:
+    """
+    Tracks the documents of one research run and spots near-duplicates
+
+    The first document seen is kept; later mirrors, syndicated copies and
+    AMP variants are merged into it and their URLs remembered as extra
+    citations.
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._urls: Dict[str, str] = {}
+        self._fingerprints: List[Tuple[int, str]] = []
+        self.merged: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def check_url(self, url: str) -> Optional[str]:
+        """
+        Register a URL before fetching
+
+        Returns:
+            Optional[str]: URL of an already registered page with the same
+            canonical URL, or None if this URL is new
+        """
+        key = canonicalize_url(url)
+        with self._lock:
+            kept = self._urls.get(key)
+            if kept is None:
+                self._urls[key] = url
+                return None
+            # The same URL found again (e.g. by another sub-question) isn't a mirror
+            if url != kept:
+                self.merged.setdefault(kept, []).append(url)
+            return kept
+
+    def check_content(self, url: str, text: str) -> Optional[str]:
+        """
+        Register an extracted document
+
+        Returns:
+            Optional[str]: URL of the kept document this one nearly duplicates,
+            or None if it is original
+        """
+        fingerprint = simhash(text)
+        with self._lock:
+            for other, kept in self._fingerprints:
+                if hamming_distance(fingerprint, other) <= self.max_distance:
+                    self.merged.setdefault(kept, []).append(url)
+                    return kept
+            self._fingerprints.append((fingerprint, url))
+            return None
+
+    def merged_into(self, url: str) -> List[str]:
+        """URLs that were collapsed into the given kept URL"""
+        with self._lock:
+            return list(self.merged.get(url, []))
@@ -0,0 +1,195 @@
+import importlib.util
+import io
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from src.tools import tracing
+from src.config.config import EXTRACT_WORKERS, EXTRACT_CPU_LIMIT, EXTRACT_TIMEOUT
+
+# PDFs can only be extracted when pypdf is installed; checked without importing it here
+PDF_SUPPORTED = importlib.util.find_spec("pypdf") is not None
+
+
+class ExtractionTimeout(Exception):
+    """A document used up its CPU time allowance"""
+
+
+def _on_cpu_limit(signum, frame):
+    raise ExtractionTimeout("extraction exceeded its CPU time limit")
+
+
+@contextmanager
+def _cpu_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Raise ExtractionTimeout once the process has used `seconds` of CPU time (Unix, main thread only)"""
+    timed = bool(seconds) and hasattr(signal, "ITIMER_PROF") and threading.current_thread() is threading.main_thread()
+    if timed:
+        previous = signal.signal(signal.SIGPROF, _on_cpu_limit)
+        signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        yield
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+
+def extract_document(html: bytes, cpu_limit: Optional[float] = None) -> Optional[Dict[str, str]]:
+    """
+    Extract the main text and title of an HTML page
+
+    The page is parsed once for both. With a cpu_limit (seconds, Unix only)
+    the extraction is interrupted once the process has spent that much CPU
+    time on it.
+
+    Args:
+        html (bytes): Raw page; trafilatura detects the encoding itself
+        cpu_limit (Optional[float]): CPU seconds allowed for this document
+
+    Returns:
+        Optional[Dict[str, str]]: title and content, or None if no text was found
+    """
+    # Only worker processes need trafilatura and its dependencies loaded
+    import trafilatura
+
+    with _cpu_limit(cpu_limit):
+        document = trafilatura.bare_extraction(html, with_metadata=True)
+
+    if document is None:
+        return None
+    if not isinstance(document, dict):
+        document = document.as_dict()
+    text = document.get("text") or ""
+    if document.get("comments"):
+        # Same output as trafilatura.extract, which appends comments to the text
+        text = f"{text}\n{document['comments']}".strip()
+    return {
+        "title": document.get("title") or "",
+        "content": text
+    }
+
+
+def extract_pdf(data: bytes, cpu_limit: Optional[float] = None) -> Optional[Dict[str, str]]:
+    """
+    Extract the text and title of a PDF with pypdf
+
+    Args:
+        data (bytes): The complete PDF file
+        cpu_limit (Optional[float]): CPU seconds allowed for this document
+
+    Returns:
+        Optional[Dict[str, str]]: title and content, or None if the PDF has no text layer
+    """
+    from pypdf import PdfReader
+
+    with _cpu_limit(cpu_limit):
+        reader = PdfReader(io.BytesIO(data))
+        pages = [page.extract_text() or "" for page in reader.pages]
+        metadata = reader.metadata
+    text = "\n\n".join(page.strip() for page in pages if page.strip())
+    if not text:
+        return None
+    return {
+        "title": (metadata.title if metadata else None) or "",
+        "content": text
+    }
+
+
+class Extractor:
+    """
+    Runs HTML and PDF extraction in a pool of worker processes
+
+    Extraction is CPU-bound, so running it in the fetching threads would hold
+    the GIL and stall downloads. The pool is started on first use and
+    replaced if a worker dies (e.g. killed for running out of memory). The
+    CPU limit signal can't interrupt C code such as lxml's parser and may be
+    swallowed by broad excepts in the extraction libraries, so when a page
+    takes longer than `timeout` seconds its pool is killed and replaced.
+    With workers=0 documents are extracted in the calling thread instead.
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACT_WORKERS,
+        cpu_limit: Optional[float] = EXTRACT_CPU_LIMIT,
+        timeout: Optional[float] = EXTRACT_TIMEOUT
+    ):
+        self.workers = workers
+        self.cpu_limit = cpu_limit
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a process full of threads can copy held locks, so start workers cleanly
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._executor
+
+    def _reset(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _kill(self, stuck: ProcessPoolExecutor):
+        """Kill the workers of a pool that stopped responding and replace it"""
+        # ProcessPoolExecutor has no public way to stop a busy worker
+        for process in list((stuck._processes or {}).values()):
+            process.kill()
+        self._reset(stuck)
+
+    def extract(self, html: bytes, url: str = "", pdf: bool = False) -> Optional[Dict[str, str]]:
+        """
+        Extract the main text and title of a page
+
+        Args:
+            html (bytes): Raw page
+            url (str): Page URL, only used for error messages and tracing
+            pdf (bool): The page is a PDF rather than HTML
+
+        Returns:
+            Optional[Dict[str, str]]: title and content, or None if nothing could be extracted
+
+        Raises:
+            BrokenProcessPool: A worker died while extracting, or was killed because
+                another page timed out; the pool is replaced
+        """
+        extract_fn = extract_pdf if pdf else extract_document
+        with tracing.span("extract", url=url):
+            if not self.workers:
+                try:
+                    return extract_fn(html, self.cpu_limit)
+                except Exception as e:
+                    print(f"Error extracting content from {url}: {str(e)}")
+                    return None
+
+            pool = self._pool()
+            try:
+                return pool.submit(extract_fn, html, self.cpu_limit).result(timeout=self.timeout)
+            except FutureTimeout:
+                # Pages extracted alongside it in the same pool fail with BrokenProcessPool
+                print(f"Error extracting content from {url}: no result after {self.timeout}s, restarting the extraction workers")
+                tracing.increment("timeouts")
+                self._kill(pool)
+                return None
+            except BrokenProcessPool:
+                # Start fresh workers for the next page; this one fails rather than
+                # being cached as empty, since the crash may not have been its fault
+                self._reset(pool)
+                raise
+            except Exception as e:
+                print(f"Error extracting content from {url}: {str(e)}")
+                return None
+
+    def close(self, wait: bool = False):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,163 @@
+import requests
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from src.config.config import (
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    POOL_TIMEOUT,
+    USER_AGENT
+)
+
+# urllib3 only decodes brotli responses when a brotli module is installed,
+# so only advertise "br" when we can actually read it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+TimingHook = Callable[[Dict], None]
+
+
+class _BoundedHTTPConnectionPool(HTTPConnectionPool):
+    """Waits at most POOL_TIMEOUT for a free connection (requests never passes a pool timeout)"""
+
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(timeout=POOL_TIMEOUT if timeout is None else timeout)
+
+
+class _BoundedHTTPSConnectionPool(HTTPSConnectionPool):
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(timeout=POOL_TIMEOUT if timeout is None else timeout)
+
+
+class _BoundedAdapter(HTTPAdapter):
+    """
+    Adapter that never opens more than pool_maxsize connections to a host
+
+    With pool_block=True a request to a host whose connections are all in
+    use waits for one to be returned (up to POOL_TIMEOUT, then urllib3's
+    EmptyPoolError) instead of opening an extra, unpooled connection.
+    """
+
+    def __init__(self, pool_connections: int, pool_maxsize: int):
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _BoundedHTTPConnectionPool,
+            "https": _BoundedHTTPSConnectionPool
+        }
+
+
+class HttpClient:
+    """
+    Shared HTTP transport with keep-alive connection pooling
+
+    One instance is owned by ResearchAgent and handed to every tool, so
+    DuckDuckGo, page and OpenRouter requests reuse warm TCP/TLS connections.
+    At most pool_maxsize connections are open to any one host at a time;
+    streamed responses hold theirs until they are closed.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = _BoundedAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": ACCEPT_ENCODING
+        })
+        self._hooks: List[TimingHook] = []
+        self._hooks_lock = threading.Lock()
+
+    def add_timing_hook(self, hook: TimingHook):
+        """
+        Register a callback invoked after every request
+
+        The callback receives a dict with method, url, host, status, elapsed
+        (total seconds), ttfb (seconds until headers arrived) and bytes
+        (Content-Length when sent, otherwise the decoded body size; None for
+        streamed responses).
+        """
+        with self._hooks_lock:
+            self._hooks.append(hook)
+
+    def remove_timing_hook(self, hook: TimingHook):
+        """Unregister a callback added with add_timing_hook"""
+        with self._hooks_lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    def _emit(self, timing: Dict):
+        with self._hooks_lock:
+            hooks = list(self._hooks)
+        for hook in hooks:
+            try:
+                hook(timing)
+            except Exception as e:
+                print(f"Error in HTTP timing hook: {str(e)}")
+
+    def request(self, method: str, url: str, timeout: Optional[Tuple[float, float]] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session
+
+        Args:
+            method (str): HTTP method
+            url (str): URL to request
+            timeout (Optional[Tuple[float, float]]): (connect, read) timeout override
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: The response
+        """
+        start = time.perf_counter()
+        status = None
+        response = None
+        try:
+            response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            size = None
+            if response is not None and not kwargs.get("stream"):
+                size = response.headers.get("Content-Length")
+                size = int(size) if size and size.isdigit() else len(response.content)
+            self._emit({
+                "method": method,
+                "url": url,
+                "host": urlparse(url).netloc,
+                "status": status,
+                "elapsed": time.perf_counter() - start,
+                "ttfb": response.elapsed.total_seconds() if response is not None else None,
+                "bytes": size
+            })
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
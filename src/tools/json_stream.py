@@ -0,0 +1,146 @@
+import json
+from typing import Any, Dict, List, Optional
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONParser:
+    """
+    Parses a streamed JSON object as its text arrives
+
+    Top-level fields become available as soon as their value is complete,
+    and the items of a top-level array become available one by one while
+    the array is still being generated. Any text before the opening brace,
+    such as a markdown code fence, is ignored.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start = 0
+        self._array_items: Optional[List] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, text: str) -> bool:
+        """
+        Add the next piece of streamed text
+
+        Returns:
+            bool: True if a field or array item was completed by this text
+        """
+        self._buffer += text
+        changed = False
+        buf = self._buffer
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+            if self._state == "done":
+                break
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._state == "in_key":
+                        self._key = json.loads(buf[self._key_start:i + 1])
+                        self._state = "colon"
+                continue
+
+            if self._state == "start":
+                if c == "{":
+                    self._state = "key"
+                    self._depth = 1
+                continue
+
+            if c in _WHITESPACE:
+                continue
+
+            if self._state == "key":
+                if c == '"':
+                    self._in_string = True
+                    self._state = "in_key"
+                    self._key_start = i
+                elif c == "}":
+                    self._state = "done"
+                continue
+
+            if self._state == "colon":
+                if c == ":":
+                    self._state = "value"
+                continue
+
+            if self._state == "value":
+                self._state = "in_value"
+                self._value_start = i
+                if c == "[":
+                    self._array_items = []
+                    self._item_start = None
+                    self._depth += 1
+                    continue
+
+            # Inside a value
+            in_array = self._array_items is not None and self._depth == 2
+            if in_array and self._item_start is None and c not in ",]":
+                self._item_start = i
+
+            if c == '"':
+                self._in_string = True
+            elif c in "[{":
+                self._depth += 1
+            elif c == "]" or c == "}":
+                if in_array:
+                    changed |= self._finish_item(i)
+                self._depth -= 1
+                if self._depth == 0:
+                    changed |= self._finish_value(i)
+                    self._state = "done"
+            elif c == ",":
+                if self._depth == 1:
+                    changed |= self._finish_value(i)
+                    self._state = "key"
+                elif in_array:
+                    changed |= self._finish_item(i)
+
+        self._pos = len(buf)
+        return changed
+
+    def _finish_item(self, end: int) -> bool:
+        if self._item_start is None:
+            return False
+        text = self._buffer[self._item_start:end].strip()
+        self._item_start = None
+        try:
+            self._array_items.append(json.loads(text))
+            return True
+        except ValueError:
+            return False
+
+    def _finish_value(self, end: int) -> bool:
+        text = self._buffer[self._value_start:end].strip()
+        self._array_items = None
+        try:
+            self.fields[self._key] = json.loads(text)
+            return True
+        except ValueError:
+            return False
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the object has been seen"""
+        return self._state == "done"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Completed fields, plus the completed items of an array still being streamed"""
+        result = dict(self.fields)
+        if self._array_items is not None and self._key not in result:
+            result[self._key] = list(self._array_items)
+        return result
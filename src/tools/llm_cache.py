@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from src.config.config import CACHE_DIR, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of LLM completions
+
+    Responses are keyed by everything that influences the completion: the
+    model and sampling parameters, the prompt template version, and hashes
+    of the content and context that were filled into the template.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "llm.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT,
+                    created_at REAL,
+                    accessed_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        prompt_version: str,
+        content: str,
+        context: str = ""
+    ) -> str:
+        """
+        Build the cache key for a completion
+
+        Args:
+            kind (str): Which prompt template was used, e.g. "summarize"
+            model (str): Model name
+            temperature (float): Sampling temperature
+            max_tokens (int): Completion token limit
+            prompt_version (str): Version of the prompt template
+            content (str): Content filled into the template
+            context (str): Context filled into the template
+
+        Returns:
+            str: Hex digest identifying the completion
+        """
+        return _sha256(json.dumps([
+            kind,
+            model,
+            temperature,
+            max_tokens,
+            prompt_version,
+            _sha256(content),
+            _sha256(context)
+        ]))
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None if absent or expired"""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting the least recently used entries if over capacity"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the number of cached responses"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from src.config.config import CACHE_DIR, PAGE_CACHE_TTL, PAGE_CACHE_MAX_BYTES
+
+
+class PageCache:
+    """
+    Persistent SQLite cache of downloaded pages and their extracted content
+
+    Entries keep the raw response bytes, the extracted title and text, and
+    the ETag/Last-Modified validators needed to revalidate them once they
+    are older than the TTL. The total size is bounded by evicting the least
+    recently used pages.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = PAGE_CACHE_TTL, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "pages.sqlite3")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    raw BLOB,
+                    title TEXT,
+                    content TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL,
+                    accessed_at REAL,
+                    size INTEGER
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a page
+
+        Args:
+            url (str): URL of the page
+
+        Returns:
+            Optional[Dict]: Cached entry with raw, title, content, etag,
+            last_modified and a `fresh` flag telling whether it is within the
+            TTL, or None if the page is not cached
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT raw, title, content, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+            fresh = now - row[5] < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+            return {
+                "raw": row[0],
+                "title": row[1],
+                "content": row[2],
+                "etag": row[3],
+                "last_modified": row[4],
+                "fresh": fresh
+            }
+
+    def put(self, url: str, raw: bytes, title: str, content: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a downloaded page and its extracted content"""
+        now = time.time()
+        size = len(raw or b"") + len((content or "").encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, raw, title, content, etag, last_modified, now, now, size)
+            )
+            self._evict()
+
+    def mark_revalidated(self, url: str):
+        """Restart the TTL of an entry after the server answered 304 Not Modified"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.revalidated += 1
+            self.hits += 1
+
+    def _evict(self):
+        """Drop least recently used pages until the cache fits in max_bytes (lock held)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall():
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the current size of the cache"""
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "revalidated": self.revalidated,
+                "entries": entries,
+                "bytes": total
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
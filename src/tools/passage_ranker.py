@@ -0,0 +1,139 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+from src.tools.chunker import estimate_tokens
+from src.config.config import PASSAGE_TOKENS, BM25_K1, BM25_B
+
+_WORD_RE = re.compile(r"\w+")
+_PARAGRAPH_RE = re.compile(r"[^\n]+")
+# Marks the gaps between selected passages
+PASSAGE_SEPARATOR = "\n\n[...]\n\n"
+
+STOPWORDS = frozenset("""
+a an and are as at be but by did do does for from had has have how i if in into is it its
+of on or so than that the their them then there these they this to was we were what when
+where which who why will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed"""
+    return [t for t in _WORD_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class PassageRanker:
+    """
+    BM25 ranking of paragraph windows within a single document
+
+    Used to send only the parts of a page that are relevant to the
+    sub-question to the LLM. Passages keep their character offsets into the
+    original text so quotes can be traced back to the source.
+    """
+
+    def __init__(self, window_tokens: int = PASSAGE_TOKENS, k1: float = BM25_K1, b: float = BM25_B):
+        self.window_tokens = window_tokens
+        self.k1 = k1
+        self.b = b
+
+    def split_passages(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Group consecutive paragraphs into windows of about window_tokens
+
+        Returns:
+            List[Tuple[int, int]]: (start, end) character offsets of each passage
+        """
+        passages = []
+        start = end = None
+        tokens = 0
+        for match in _PARAGRAPH_RE.finditer(text):
+            if not match.group().strip():
+                continue
+            paragraph_tokens = estimate_tokens(match.group())
+            if start is not None and tokens + paragraph_tokens > self.window_tokens:
+                passages.append((start, end))
+                start = None
+            if start is None:
+                start, tokens = match.start(), 0
+            end = match.end()
+            tokens += paragraph_tokens
+        if start is not None:
+            passages.append((start, end))
+        return passages
+
+    def score(self, passages: List[str], query: str) -> List[float]:
+        """
+        Score passages against a query with BM25
+
+        Scoring is term-at-a-time: each query term is looked up in a single
+        postings map and its contribution added to every passage containing
+        it, so passages without any query term cost nothing.
+        """
+        terms = set(tokenize(query))
+        scores = [0.0] * len(passages)
+        if not terms or not passages:
+            return scores
+
+        lengths = []
+        postings = {term: [] for term in terms}
+        for i, passage in enumerate(passages):
+            tokens = tokenize(passage)
+            lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                if term in postings:
+                    postings[term].append((i, count))
+
+        n = len(passages)
+        avg_length = (sum(lengths) / n) or 1.0
+        norms = [self.k1 * (1 - self.b + self.b * length / avg_length) for length in lengths]
+        for term, docs in postings.items():
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for i, tf in docs:
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + norms[i])
+        return scores
+
+    def select(self, text: str, query: str, budget_tokens: int) -> Tuple[str, List[Dict]]:
+        """
+        Keep the passages most relevant to the query, up to a token budget
+
+        The budget covers the separators between passages too, so the
+        joined selection is never estimated above budget_tokens.
+
+        Args:
+            text (str): Document text
+            query (str): Sub-question to rank passages against
+            budget_tokens (int): Maximum estimated tokens of passages to keep
+
+        Returns:
+            Tuple[str, List[Dict]]: The selected passages joined in document
+            order, and their start/end offsets and scores
+        """
+        spans = self.split_passages(text)
+        passages = [text[start:end] for start, end in spans]
+        scores = self.score(passages, query)
+
+        # Stable sort: with no matching terms the leading passages win
+        ranked = sorted(range(len(spans)), key=lambda i: scores[i], reverse=True)
+        chosen = []
+        remaining = budget_tokens
+        separator_tokens = estimate_tokens(PASSAGE_SEPARATOR)
+        for i in ranked:
+            # Every passage after the first adds a separator to the joined text
+            tokens = estimate_tokens(passages[i]) + (separator_tokens if chosen else 0)
+            if tokens > remaining:
+                continue
+            chosen.append(i)
+            remaining -= tokens
+        chosen.sort()
+
+        if not chosen:
+            # Every passage is larger than the budget; leave splitting to the summarizer
+            return text, [{"start": 0, "end": len(text), "score": 0.0}]
+
+        selected = [
+            {"start": spans[i][0], "end": spans[i][1], "score": round(scores[i], 3)}
+            for i in chosen
+        ]
+        return PASSAGE_SEPARATOR.join(passages[i] for i in chosen), selected
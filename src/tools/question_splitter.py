@@ -0,0 +1,28 @@
+import re
+from typing import List
+
+# Boundaries between the separate questions of a compound question
+_BOUNDARY = re.compile(r"(?<=\?)\s+|;\s*|\n+")
+
+
+def split_question(question: str, max_parts: int) -> List[str]:
+    """
+    Split a compound question into its parts without calling the LLM
+
+    "What is X? How does it compare to Y?" becomes two sub-questions; a
+    single question is returned as is.
+
+    Args:
+        question (str): The research question
+        max_parts (int): Maximum number of parts to return
+
+    Returns:
+        List[str]: Distinct parts of at least three words, in order
+    """
+    parts = []
+    for part in _BOUNDARY.split(question):
+        part = part.strip()
+        # Fragments like "and why?" lack the context to be searched on their own
+        if len(part.split()) >= 3 and part not in parts:
+            parts.append(part)
+    return parts[:max_parts] or [question.strip()]
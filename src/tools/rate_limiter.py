@@ -0,0 +1,231 @@
+import multiprocessing
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+import requests
+from src.tools import tracing
+from src.config.config import (
+    MAX_LLM_WORKERS,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX
+)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1):
+        """Block until `amount` tokens are available and take them"""
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted AIMD-style
+
+    The limit grows by one slot per limit's worth of successful calls and is
+    halved whenever a call is throttled.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1, decrease: float = 0.5):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.minimum = minimum
+        self.decrease = decrease
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """
+    Client-side scheduler shared by all OpenRouter calls
+
+    Every call passes through a request-rate and a token-rate bucket and an
+    AIMD concurrency limit. Throttled (429) and transient failures are
+    retried with full-jitter exponential backoff, honoring Retry-After; a
+    Retry-After on a 429 pauses all callers, not just the one that got it.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+        max_concurrency: int = MAX_LLM_WORKERS,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+        request_bucket: Optional[TokenBucket] = None,
+        token_bucket: Optional[TokenBucket] = None
+    ):
+        # Buckets may be passed in to share one budget, e.g. across processes
+        self.request_bucket = request_bucket or TokenBucket(requests_per_minute)
+        self.token_bucket = token_bucket or TokenBucket(tokens_per_minute)
+        self.limiter = AdaptiveLimiter(max_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_for_pause(self):
+        while True:
+            with self._lock:
+                delay = self._paused_until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _classify(self, error: Exception):
+        """Return (retryable, throttled, retry_after) for a failed call"""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True, False, None
+        response = getattr(error, "response", None)
+        if isinstance(error, requests.HTTPError) and response is not None:
+            status = response.status_code
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            return status in RETRYABLE_STATUS, status == 429, retry_after
+        return False, False, None
+
+    def call(self, fn: Callable[[], T], tokens: int = 0) -> T:
+        """
+        Run an OpenRouter call under the rate limits, retrying transient failures
+
+        Args:
+            fn (Callable[[], T]): Performs the request; HTTP errors must be raised
+                (e.g. via raise_for_status) for them to be retried
+            tokens (int): Estimated prompt plus completion tokens of the call
+
+        Returns:
+            T: Whatever fn returns
+        """
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_pause()
+            self.request_bucket.acquire(1)
+            if tokens:
+                self.token_bucket.acquire(tokens)
+
+            self.limiter.acquire()
+            throttled = False
+            try:
+                with self._lock:
+                    self.calls += 1
+                return fn()
+            except Exception as e:
+                retryable, throttled, retry_after = self._classify(e)
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                tracing.increment("retries")
+                with self._lock:
+                    self.retries += 1
+                    if throttled:
+                        self.throttled += 1
+                        if retry_after is not None:
+                            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+            finally:
+                self.limiter.release(throttled)
+            time.sleep(delay)
+
+    def stats(self) -> Dict:
+        """Return call/retry counters and the current concurrency limit"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "concurrency_limit": round(self.limiter.limit, 2)
+            }
+
+
+class SharedTokenBucket:
+    """
+    Token bucket whose state lives in shared memory, so several processes
+    draw from one budget
+
+    Create it in the parent and hand it to workers when they start (e.g. via
+    a pool initializer); it can't be sent to a process that is already running.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None, context=None):
+        context = context or multiprocessing.get_context()
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        # CLOCK_MONOTONIC is system-wide, so timestamps compare across processes
+        self._state = context.Array("d", [self.capacity, time.monotonic()])
+
+    def acquire(self, amount: float = 1):
+        """Block until `amount` tokens are available and take them"""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._state.get_lock():
+                tokens, updated = self._state[0], self._state[1]
+                now = time.monotonic()
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+                if tokens >= amount:
+                    self._state[0], self._state[1] = tokens - amount, now
+                    return
+                self._state[0], self._state[1] = tokens, now
+                wait = (amount - tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,161 @@
+import copy
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+from src.tools import tracing
+from src.config.config import CACHE_DIR, SEARCH_CACHE_TTL, SEARCH_CACHE_MAX_ENTRIES
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so trivially different spellings share a cache entry
+
+    Case, Unicode compatibility forms, punctuation and runs of whitespace are
+    ignored.
+    """
+    query = unicodedata.normalize("NFKC", query).casefold()
+    query = re.sub(r"[^\w\s+#]", " ", query)
+    return " ".join(query.split())
+
+
+class SearchCache:
+    """
+    TTL cache of search results keyed by normalized query
+
+    Results live in a bounded in-memory LRU and are optionally persisted to
+    SQLite so they survive restarts. Concurrent lookups of the same query
+    while it is being fetched wait for that single in-flight request instead
+    of issuing their own.
+    """
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL, max_entries: int = SEARCH_CACHE_MAX_ENTRIES, path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS searches (
+                        key TEXT PRIMARY KEY,
+                        results TEXT,
+                        expires_at REAL
+                    )
+                """)
+
+    @classmethod
+    def persistent(cls) -> "SearchCache":
+        """Create a cache backed by a file in CACHE_DIR"""
+        return cls(path=os.path.join(CACHE_DIR, "searches.sqlite3"))
+
+    def _get_locked(self, key: str) -> Optional[List[Dict]]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+        if self._conn is not None:
+            row = self._conn.execute(
+                "SELECT results, expires_at FROM searches WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                results = json.loads(row[0])
+                self._store_locked(key, results, row[1])
+                return results
+        return None
+
+    def _store_locked(self, key: str, results: List[Dict], expires_at: float):
+        self._entries[key] = (expires_at, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, query: str, results: List[Dict]):
+        """Store the results for a query"""
+        key = normalize_query(query)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store_locked(key, copy.deepcopy(results), expires_at)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO searches VALUES (?, ?, ?)",
+                        (key, json.dumps(results), expires_at)
+                    )
+                    self._conn.execute("DELETE FROM searches WHERE expires_at <= ?", (time.time(),))
+
+    def get_or_fetch(self, query: str, fetch: Callable[[str], List[Dict]]) -> List[Dict]:
+        """
+        Return cached results for a query, fetching them if necessary
+
+        Args:
+            query (str): Search query
+            fetch (Callable[[str], List[Dict]]): Performs the actual search
+
+        Returns:
+            List[Dict]: Search results (a copy the caller may modify)
+        """
+        key = normalize_query(query)
+        with self._lock:
+            cached = self._get_locked(key)
+            if cached is not None:
+                self.hits += 1
+                tracing.increment("cache_hits")
+                return copy.deepcopy(cached)
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = Future()
+                self._inflight[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return copy.deepcopy(flight.result())
+
+        try:
+            results = fetch(query)
+            # An empty page usually means we were throttled, so don't keep it
+            if results:
+                self.put(query, results)
+            flight.set_result(results)
+            return copy.deepcopy(results)
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the number of in-memory entries"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries)
+            }
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
@@ -1,11 +1,40 @@
 import requests
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
 import time
 from urllib.parse import quote_plus, urlparse, urljoin
-from src.config.config import MAX_SEARCH_RESULTS, MAX_RETRIES, TIMEOUT, USER_AGENT
+from src.config.config import (
+    SEARCH_URL,
+    MAX_SEARCH_RESULTS,
+    MAX_SEARCH_CANDIDATES,
+    SEARCH_REQUESTS_PER_MINUTE,
+    MAX_RETRIES,
+    USER_AGENT
+)
+from src.tools.http_client import HttpClient
+from src.tools.rate_limiter import TokenBucket
+from src.tools.search_cache import SearchCache
+from src.tools import tracing
+
+
+@lru_cache(maxsize=None)
+def _beautiful_soup():
+    """Import BeautifulSoup once, on the first search, instead of at startup"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup
+
 
 class SearchTool:
-    def __init__(self):
+    def __init__(
+        self,
+        http: Optional[HttpClient] = None,
+        cache: Optional[SearchCache] = None,
+        rate_limit: Optional[TokenBucket] = None
+    ):
+        self.http = http or HttpClient()
+        self.cache = cache
+        # Pass a SharedTokenBucket to share the rate with other processes
+        self.rate_limit = rate_limit or TokenBucket(SEARCH_REQUESTS_PER_MINUTE)
         self.headers = {
             'User-Agent': USER_AGENT
         }
@@ -18,39 +47,51 @@ class SearchTool:
             return f'https://{url}'
         return url
 
-    def search(self, query: str) -> List[Dict]:
+    def search(self, query: str, max_results: int = MAX_SEARCH_RESULTS) -> List[Dict]:
         """
         Perform a web search using DuckDuckGo and return results
         
+        Repeated and equivalent queries are answered from the search cache,
+        and identical concurrent queries share a single request.
+        
         Args:
             query (str): Search query
+            max_results (int): Number of results to return, up to MAX_SEARCH_CANDIDATES
             
         Returns:
             List[Dict]: List of search results with title, link, and snippet
         """
+        if self.cache:
+            results = self.cache.get_or_fetch(query, self._search_uncached)
+        else:
+            results = self._search_uncached(query)
+        return results[:max_results]
+
+    def _search_uncached(self, query: str) -> List[Dict]:
+        """Scrape up to MAX_SEARCH_CANDIDATES DuckDuckGo results, retrying with exponential backoff"""
         for attempt in range(MAX_RETRIES):
             try:
                 # DuckDuckGo's search API endpoint
                 encoded_query = quote_plus(query)
-                url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
+                url = f"{SEARCH_URL}?q={encoded_query}"
                 
-                response = requests.get(
+                self.rate_limit.acquire()
+                response = self.http.get(
                     url,
-                    headers=self.headers,
-                    timeout=TIMEOUT
+                    headers=self.headers
                 )
                 
                 response.raise_for_status()
+                tracing.increment("bytes", len(response.content))
                 
                 # Use BeautifulSoup to parse the HTML response
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = _beautiful_soup()(response.text, 'html.parser')
                 
                 # Extract search results
                 results = soup.find_all('div', class_='result')
                 formatted_results = []
                 
-                for result in results[:MAX_SEARCH_RESULTS]:
+                for result in results[:MAX_SEARCH_CANDIDATES]:
                     title_elem = result.find('a', class_='result__a')
                     snippet_elem = result.find('a', class_='result__snippet')
                     
@@ -74,6 +115,7 @@ class SearchTool:
             except Exception as e:
                 if attempt == MAX_RETRIES - 1:
                     raise Exception(f"Failed to perform search after {MAX_RETRIES} attempts: {str(e)}")
+                tracing.increment("retries")
                 time.sleep(2 ** attempt)  # Exponential backoff
                 
         return [] 
\ No newline at end of file
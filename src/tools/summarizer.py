@@ -1,26 +1,219 @@
-import requests
 import json
-from typing import Dict, List
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from src.tools.http_client import HttpClient
+from src.tools.chunker import estimate_tokens, chunk_text
+from src.tools.llm_cache import ResponseCache
+from src.tools.json_stream import IncrementalJSONParser
+from src.tools.rate_limiter import LLMScheduler
+from src.tools import tracing
 from src.config.config import (
-    OPENROUTER_API_KEY, 
+    OPENROUTER_API_KEY,
+    CONNECT_TIMEOUT,
+    LLM_READ_TIMEOUT,
     MODEL_NAME, 
     TEMPERATURE, 
     MAX_TOKENS,
+    PROMPT_VERSION,
+    CHUNK_TOKENS,
+    MAX_DOCUMENT_TOKENS,
+    MAX_CHUNK_WORKERS,
+    MAX_LLM_WORKERS,
+    CROSS_VALIDATION_FAN_IN,
+    LLM_CACHE_BYPASS_SAMPLED,
     OPENROUTER_API_URL,
     SITE_URL,
     SITE_NAME
 )
 
 class Summarizer:
-    def __init__(self):
-        if not OPENROUTER_API_KEY:
-            raise ValueError("OPENROUTER_API_KEY not found in environment variables")
+    def __init__(
+        self,
+        http: Optional[HttpClient] = None,
+        cache: Optional[ResponseCache] = None,
+        scheduler: Optional[LLMScheduler] = None
+    ):
         self.headers = {
             "Authorization": f"Bearer {OPENROUTER_API_KEY}",
             "Content-Type": "application/json",
             "HTTP-Referer": SITE_URL,
             "X-Title": SITE_NAME,
         }
+        self.http = http or HttpClient()
+        self.timeout = (CONNECT_TIMEOUT, LLM_READ_TIMEOUT)
+        self.cache = cache
+        self.scheduler = scheduler or LLMScheduler()
+
+    def _complete(
+        self,
+        kind: str,
+        prompt: str,
+        content: str,
+        context: str = "",
+        use_cache: bool = True,
+        on_partial: Optional[Callable[[Dict], None]] = None,
+        deadline: Optional[float] = None
+    ) -> str:
+        """
+        Send a prompt to OpenRouter and return the completion text
+
+        Completions are served from the response cache when possible. The key
+        covers the prompt template (`kind` and PROMPT_VERSION) and the content
+        and context that were filled into it.
+
+        Args:
+            kind (str): Name of the prompt template
+            prompt (str): Fully rendered prompt
+            content (str): Content filled into the template
+            context (str): Context filled into the template
+            use_cache (bool): Set to False to always call the model
+            on_partial (Optional[Callable[[Dict], None]]): If given, the completion
+                is streamed and this is called with the JSON fields parsed so far
+            deadline (Optional[float]): time.monotonic() by which the call must
+                finish; requests time out then and are not retried after it
+
+        Returns:
+            str: The completion text
+        """
+        if LLM_CACHE_BYPASS_SAMPLED and TEMPERATURE > 0:
+            use_cache = False
+
+        key = None
+        if self.cache and use_cache:
+            key = ResponseCache.make_key(kind, MODEL_NAME, TEMPERATURE, MAX_TOKENS, PROMPT_VERSION, content, context)
+            cached = self.cache.get(key)
+            if cached is not None:
+                tracing.increment("cache_hits")
+                if on_partial:
+                    self._partial_callback(on_partial)(cached)
+                return cached
+
+        payload = {
+            "model": MODEL_NAME,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": TEMPERATURE,
+            "max_tokens": MAX_TOKENS,
+            "response_format": { "type": "json_object" },
+            # Ask OpenRouter to report token usage, including on streamed responses
+            "usage": { "include": True }
+        }
+        # Checked here rather than at construction, so the app starts (and cached
+        # responses are served) without a key
+        if not OPENROUTER_API_KEY:
+            raise ValueError("OPENROUTER_API_KEY not found in environment variables")
+
+        tokens = estimate_tokens(prompt) + MAX_TOKENS
+        if on_partial:
+            # A retried request starts the completion over, so it gets a fresh parser
+            # rather than feeding the already parsed prefix in again
+            text = self.scheduler.call(
+                lambda: self._until(deadline, lambda timeout: self._stream_completion(payload, self._partial_callback(on_partial), timeout, deadline)),
+                tokens=tokens
+            )
+        else:
+            text = self.scheduler.call(
+                lambda: self._until(deadline, lambda timeout: self._post_completion(payload, timeout)),
+                tokens=tokens
+            )
+
+        if key is not None:
+            self.cache.put(key, text)
+        return text
+
+    def _until(self, deadline: Optional[float], request: Callable[[Tuple[float, float]], str]) -> str:
+        """
+        Run a request with timeouts that end at the deadline
+
+        Once the deadline has passed, TimeoutError is raised instead of the
+        requests timeout; it isn't retryable, so the scheduler gives up
+        rather than spending rate limit on an attempt that can't finish.
+        """
+        if deadline is None:
+            return request(self.timeout)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("time budget exhausted")
+        try:
+            return request((min(self.timeout[0], remaining), min(self.timeout[1], remaining)))
+        except requests.Timeout:
+            if time.monotonic() >= deadline:
+                raise TimeoutError("time budget exhausted")
+            raise
+
+    def _post_completion(self, payload: Dict, timeout: Optional[Tuple[float, float]] = None) -> str:
+        """Request a completion and return its text"""
+        response = self.http.post(
+            OPENROUTER_API_URL,
+            headers=self.headers,
+            timeout=timeout or self.timeout,
+            data=json.dumps(payload)
+        )
+        
+        response.raise_for_status()
+        response_data = response.json()
+        self._record_usage(response_data.get("usage"))
+        return response_data["choices"][0]["message"]["content"]
+
+    def _record_usage(self, usage: Optional[Dict]):
+        """Add OpenRouter's reported token usage to the current trace span"""
+        if usage:
+            tracing.increment("prompt_tokens", usage.get("prompt_tokens") or 0)
+            tracing.increment("completion_tokens", usage.get("completion_tokens") or 0)
+
+    def _stream_completion(
+        self,
+        payload: Dict,
+        on_text: Callable[[str], None],
+        timeout: Optional[Tuple[float, float]] = None,
+        deadline: Optional[float] = None
+    ) -> str:
+        """
+        Request a completion as server-sent events and collect its text
+
+        Args:
+            payload (Dict): Chat completion request body
+            on_text (Callable[[str], None]): Called with each content delta
+            timeout (Optional[Tuple[float, float]]): (connect, read) timeout override
+            deadline (Optional[float]): time.monotonic() after which the stream is
+                abandoned; keep-alive lines would otherwise reset the read timeout
+
+        Returns:
+            str: The full completion text
+        """
+        response = self.http.post(
+            OPENROUTER_API_URL,
+            headers=self.headers,
+            timeout=timeout or self.timeout,
+            data=json.dumps(dict(payload, stream=True)),
+            stream=True
+        )
+        with response:
+            response.raise_for_status()
+            pieces = []
+            # SSE is always UTF-8; requests would guess ISO-8859-1 for text/event-stream
+            for raw_line in response.iter_lines():
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("time budget exhausted")
+                line = raw_line.decode("utf-8")
+                # Lines starting with ":" are keep-alive comments
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if "error" in event:
+                    raise Exception(f"Streaming error: {event['error']}")
+                # The final chunk carries the token usage of the whole completion
+                self._record_usage(event.get("usage"))
+                choices = event.get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    pieces.append(delta)
+                    on_text(delta)
+            return "".join(pieces)
 
     def _parse_json_response(self, text: str) -> Dict:
         """Try to parse JSON from the response text, or create a structured response"""
@@ -35,19 +228,8 @@ class Summarizer:
                 "confidence_level": "medium"
             }
 
-    def summarize(self, content: str, context: str = "") -> Dict[str, str]:
-        """
-        Summarize content using OpenRouter's LLM
-        
-        Args:
-            content (str): Content to summarize
-            context (str): Additional context or specific instructions
-            
-        Returns:
-            Dict[str, str]: Dictionary containing summary and key points
-        """
-        try:
-            prompt = f"""
+    def _summary_prompt(self, content: str, context: str) -> str:
+        return f"""
             Please analyze and summarize the following content. Provide your response in valid JSON format using this exact structure:
             {{
                 "summary": "A concise summary of the content",
@@ -61,29 +243,68 @@ class Summarizer:
             Content to analyze:
             {content}
             """
+
+    def _reduce_prompt(self, partials: str, context: str) -> str:
+        return f"""
+            The following are summaries of consecutive parts of one document. Combine them into a single summary of the whole document. Provide your response in valid JSON format using this exact structure:
+            {{
+                "summary": "A concise summary of the whole document",
+                "key_points": ["Key point 1", "Key point 2", ...],
+                "quotes": ["Notable quote 1", "Notable quote 2", ...],
+                "confidence_level": "high/medium/low"
+            }}
+
+            If provided, consider this context: {context}
             
-            response = requests.post(
-                url=OPENROUTER_API_URL,
-                headers=self.headers,
-                data=json.dumps({
-                    "model": MODEL_NAME,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": TEMPERATURE,
-                    "max_tokens": MAX_TOKENS,
-                    "response_format": { "type": "json_object" }
-                })
-            )
-            
-            response.raise_for_status()
-            response_data = response.json()
+            Partial summaries:
+            {partials}
+            """
+
+    def summarize(
+        self,
+        content: str,
+        context: str = "",
+        use_cache: bool = True,
+        on_partial: Optional[Callable[[Dict], None]] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        Summarize content using OpenRouter's LLM
+        
+        Documents longer than CHUNK_TOKENS are split on paragraph boundaries,
+        the chunks are summarized in parallel and the partial summaries are
+        combined in a final reduce call. At most MAX_DOCUMENT_TOKENS of
+        content are sent per document.
+        
+        Args:
+            content (str): Content to summarize
+            context (str): Additional context or specific instructions
+            use_cache (bool): Set to False to bypass the response cache
+            on_partial (Optional[Callable[[Dict], None]]): If given, the final
+                completion is streamed and this is called with the fields parsed
+                so far (e.g. summary, then key_points one by one) as they complete
+            deadline (Optional[float]): time.monotonic() by which the summary must be done
             
-            # Extract and parse the response text
-            summary_text = response_data["choices"][0]["message"]["content"]
-            parsed_summary = self._parse_json_response(summary_text)
+        Returns:
+            Dict[str, str]: Dictionary containing summary and key points, the
+            raw content length and the estimated number of prompt tokens sent
+        """
+        tokens_sent = 0
+        try:
+            if estimate_tokens(content) <= CHUNK_TOKENS:
+                prompt = self._summary_prompt(content, context)
+                tokens_sent = estimate_tokens(prompt)
+                
+                # Extract and parse the response text
+                summary_text = self._complete("summarize", prompt, content, context, use_cache=use_cache, on_partial=on_partial, deadline=deadline)
+                parsed_summary = self._parse_json_response(summary_text)
+            else:
+                parsed_summary, tokens_sent = self._summarize_chunked(content, context, use_cache, on_partial, deadline)
             
             return {
                 "summary": json.dumps(parsed_summary),
-                "source_length": len(content)
+                "source_length": len(content),
+                "tokens_sent": tokens_sent
             }
             
         except Exception as e:
@@ -95,19 +316,180 @@ class Summarizer:
                     "quotes": [],
                     "confidence_level": "low"
                 }),
-                "source_length": len(content)
+                "source_length": len(content),
+                "tokens_sent": tokens_sent
             }
 
-    def cross_validate(self, summaries: List[Dict]) -> Dict:
+    def _partial_callback(self, on_partial: Callable[[Dict], None]) -> Callable[[str], None]:
+        """Turn streamed completion text into on_partial calls with the fields parsed so far"""
+        parser = IncrementalJSONParser()
+
+        def on_text(text: str):
+            if parser.feed(text):
+                on_partial(parser.snapshot())
+        return on_text
+
+    def _summarize_chunked(
+        self,
+        content: str,
+        context: str,
+        use_cache: bool,
+        on_partial: Optional[Callable[[Dict], None]] = None,
+        deadline: Optional[float] = None
+    ) -> Tuple[Dict, int]:
+        """
+        Map-reduce summarization for documents that don't fit in one prompt
+
+        Only the final reduce call is streamed to on_partial.
+
+        Returns:
+            Tuple[Dict, int]: The combined summary and the estimated prompt tokens sent
+        """
+        chunks = []
+        budget = MAX_DOCUMENT_TOKENS
+        for chunk in chunk_text(content, CHUNK_TOKENS):
+            tokens = estimate_tokens(chunk)
+            if chunks and tokens > budget:
+                break
+            chunks.append(chunk)
+            budget -= tokens
+        
+        prompts = [self._summary_prompt(chunk, context) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_CHUNK_WORKERS)) as executor:
+            futures = [
+                executor.submit(tracing.bind(self._complete), "summarize", prompt, chunk, context, use_cache, None, deadline)
+                for prompt, chunk in zip(prompts, chunks)
+            ]
+        tokens_sent = sum(estimate_tokens(prompt) for prompt in prompts)
+        
+        partials = []
+        for future in futures:
+            try:
+                partials.append(self._parse_json_response(future.result()))
+            except Exception as e:
+                # One failed chunk shouldn't lose the rest of the document
+                print(f"Error summarizing chunk: {str(e)}")
+        if not partials:
+            raise Exception("All chunk summaries failed")
+        if len(partials) == 1:
+            return partials[0], tokens_sent
+        
+        partial_texts = "\n\n".join([
+            f"Part {i+1}:\nSummary: {p.get('summary', '')}\nKey Points: {', '.join(p.get('key_points', []))}\nQuotes: {' | '.join(p.get('quotes', []))}"
+            for i, p in enumerate(partials)
+        ])
+        prompt = self._reduce_prompt(partial_texts, context)
+        tokens_sent += estimate_tokens(prompt)
+        reduced_text = self._complete("reduce_summaries", prompt, partial_texts, context, use_cache=use_cache, on_partial=on_partial, deadline=deadline)
+        return self._parse_json_response(reduced_text), tokens_sent
+
+    def _decompose_prompt(self, question: str, max_sub_questions: int) -> str:
+        return f"""
+            Break the following research question into at most {max_sub_questions} focused sub-questions that together cover it and can each be answered with a single web search. If the question is already simple, return it unchanged as the only sub-question. Provide your response in valid JSON format using this exact structure:
+            {{
+                "sub_questions": ["Sub-question 1", "Sub-question 2", ...]
+            }}
+
+            Research question:
+            {question}
+            """
+
+    def decompose(self, question: str, max_sub_questions: int, use_cache: bool = True) -> List[str]:
+        """
+        Break a research question into sub-questions using the LLM
+
+        Args:
+            question (str): The research question
+            max_sub_questions (int): Maximum number of sub-questions to return
+            use_cache (bool): Set to False to bypass the response cache
+
+        Returns:
+            List[str]: Distinct sub-questions, or an empty list if the call failed
+        """
+        try:
+            prompt = self._decompose_prompt(question, max_sub_questions)
+            response = json.loads(self._complete("decompose", prompt, question, str(max_sub_questions), use_cache=use_cache))
+            sub_questions = []
+            for sub_q in response.get("sub_questions", []):
+                if isinstance(sub_q, str) and sub_q.strip() and sub_q.strip() not in sub_questions:
+                    sub_questions.append(sub_q.strip())
+            return sub_questions[:max_sub_questions]
+        except Exception as e:
+            print(f"Error decomposing question: {str(e)}")
+            return []
+
+    def _empty_cross_validation(self) -> Dict:
+        return {
+            "agreements": [],
+            "contradictions": [],
+            "unique_points": [],
+            "confidence": "low"
+        }
+
+    def _cross_validation_prompt(self, summary_texts: str) -> str:
+        return f"""
+            Please analyze these different source summaries and provide your response in valid JSON format using this exact structure:
+            {{
+                "agreements": ["Point of agreement 1", "Point of agreement 2", ...],
+                "contradictions": ["Contradiction 1", "Contradiction 2", ...],
+                "unique_points": ["Unique point 1", "Unique point 2", ...],
+                "confidence": "high/medium/low"
+            }}
+
+            Sources to analyze:
+            {summary_texts}
+            """
+
+    def _merge_prompt(self, analysis_texts: str) -> str:
+        return f"""
+            Each of the following analyses compares a different group of sources on the same topic. Merge them into one analysis covering all sources: combine agreements that hold across groups, keep contradictions (including ones between groups), and drop unique points that another group confirms. Provide your response in valid JSON format using this exact structure:
+            {{
+                "agreements": ["Point of agreement 1", "Point of agreement 2", ...],
+                "contradictions": ["Contradiction 1", "Contradiction 2", ...],
+                "unique_points": ["Unique point 1", "Unique point 2", ...],
+                "confidence": "high/medium/low"
+            }}
+
+            Group analyses to merge:
+            {analysis_texts}
+            """
+
+    def _summary_texts(self, parsed_summaries: List[Dict], offset: int = 0) -> str:
+        return "\n\n".join([
+            f"Source {offset+i+1}:\nSummary: {s.get('summary', '')}\nKey Points: {', '.join(s.get('key_points', []))}"
+            for i, s in enumerate(parsed_summaries)
+        ])
+
+    def cross_validate(
+        self,
+        summaries: List[Dict],
+        use_cache: bool = True,
+        fan_in: int = CROSS_VALIDATION_FAN_IN,
+        deadline: Optional[float] = None
+    ) -> Dict:
         """
         Cross-validate information between multiple summaries
         
+        With more than `fan_in` sources the comparison is done as a tree:
+        groups of `fan_in` sources are cross-validated in parallel and the
+        group results are merged level by level. A group that fails is left
+        out instead of failing the whole analysis.
+        
+        With a deadline, every call times out when it is reached. Merges that
+        would start after it combine the group results without the LLM, and
+        nothing is compared if it has already passed.
+        
         Args:
             summaries (List[Dict]): List of summary dictionaries
+            use_cache (bool): Set to False to bypass the response cache
+            fan_in (int): Maximum number of sources or analyses per LLM call
+            deadline (Optional[float]): time.monotonic() by which the analysis must be done
             
         Returns:
             Dict: Analysis of agreements and disagreements
         """
+        if deadline is not None and time.monotonic() >= deadline:
+            return {"cross_validation": "Cross-validation skipped: the time budget ran out", "skipped": True}
         try:
             # Prepare the summaries for comparison
             parsed_summaries = []
@@ -118,39 +500,12 @@ class Summarizer:
                 except:
                     continue
             
-            summary_texts = "\n\n".join([
-                f"Source {i+1}:\nSummary: {s.get('summary', '')}\nKey Points: {', '.join(s.get('key_points', []))}"
-                for i, s in enumerate(parsed_summaries)
-            ])
+            if len(parsed_summaries) > fan_in:
+                return self._cross_validate_tree(parsed_summaries, use_cache, max(2, fan_in), deadline)
             
-            prompt = f"""
-            Please analyze these different source summaries and provide your response in valid JSON format using this exact structure:
-            {{
-                "agreements": ["Point of agreement 1", "Point of agreement 2", ...],
-                "contradictions": ["Contradiction 1", "Contradiction 2", ...],
-                "unique_points": ["Unique point 1", "Unique point 2", ...],
-                "confidence": "high/medium/low"
-            }}
-
-            Sources to analyze:
-            {summary_texts}
-            """
-            
-            response = requests.post(
-                url=OPENROUTER_API_URL,
-                headers=self.headers,
-                data=json.dumps({
-                    "model": MODEL_NAME,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": TEMPERATURE,
-                    "max_tokens": MAX_TOKENS,
-                    "response_format": { "type": "json_object" }
-                })
-            )
-            
-            response.raise_for_status()
-            response_data = response.json()
-            analysis_text = response_data["choices"][0]["message"]["content"]
+            summary_texts = self._summary_texts(parsed_summaries)
+            prompt = self._cross_validation_prompt(summary_texts)
+            analysis_text = self._complete("cross_validate", prompt, summary_texts, use_cache=use_cache, deadline=deadline)
             
             # Ensure the response is valid JSON
             try:
@@ -158,21 +513,71 @@ class Summarizer:
                 return {"cross_validation": analysis_text}
             except:
                 return {
-                    "cross_validation": json.dumps({
-                        "agreements": [],
-                        "contradictions": [],
-                        "unique_points": [],
-                        "confidence": "low"
-                    })
+                    "cross_validation": json.dumps(self._empty_cross_validation())
                 }
             
         except Exception as e:
             print(f"Error in cross-validation: {str(e)}")
             return {
-                "cross_validation": json.dumps({
-                    "agreements": [],
-                    "contradictions": [],
-                    "unique_points": [],
-                    "confidence": "low"
-                })
-            } 
\ No newline at end of file
+                "cross_validation": json.dumps(self._empty_cross_validation())
+            }
+
+    def _analyze(self, kind: str, prompt: str, content: str, use_cache: bool, deadline: Optional[float] = None) -> Optional[Dict]:
+        """Run one cross-validation or merge call, returning None if it fails"""
+        try:
+            analysis = json.loads(self._complete(kind, prompt, content, use_cache=use_cache, deadline=deadline))
+            return analysis if isinstance(analysis, dict) else None
+        except Exception as e:
+            print(f"Error in {kind}: {str(e)}")
+            return None
+
+    def _combine_locally(self, analyses: List[Dict]) -> Dict:
+        """Concatenate group analyses without the LLM, used when a merge call fails"""
+        combined = self._empty_cross_validation()
+        for field in ("agreements", "contradictions", "unique_points"):
+            for point in (p for a in analyses for p in a.get(field, [])):
+                if point not in combined[field]:
+                    combined[field].append(point)
+        levels = [a.get("confidence", "low") for a in analyses]
+        combined["confidence"] = next((level for level in ("low", "medium", "high") if level in levels), "low")
+        return combined
+
+    def _merge_analyses(self, analyses: List[Dict], use_cache: bool, deadline: Optional[float] = None) -> Dict:
+        """Merge up to fan_in group analyses into one"""
+        if len(analyses) == 1:
+            return analyses[0]
+        if deadline is not None and time.monotonic() >= deadline:
+            return self._combine_locally(analyses)
+        analysis_texts = "\n\n".join(
+            f"Group analysis {i+1}:\n{json.dumps(a)}" for i, a in enumerate(analyses)
+        )
+        prompt = self._merge_prompt(analysis_texts)
+        merged = self._analyze("merge_cross_validation", prompt, analysis_texts, use_cache, deadline)
+        return merged if merged is not None else self._combine_locally(analyses)
+
+    def _cross_validate_tree(self, parsed_summaries: List[Dict], use_cache: bool, fan_in: int, deadline: Optional[float] = None) -> Dict:
+        """Cross-validate groups of sources in parallel, then merge the group results"""
+        def analyze_group(start: int) -> Optional[Dict]:
+            summary_texts = self._summary_texts(parsed_summaries[start:start + fan_in], start)
+            prompt = self._cross_validation_prompt(summary_texts)
+            return self._analyze("cross_validate", prompt, summary_texts, use_cache, deadline)
+
+        starts = range(0, len(parsed_summaries), fan_in)
+        with ThreadPoolExecutor(max_workers=min(len(starts), MAX_LLM_WORKERS)) as executor:
+            results = [f.result() for f in [executor.submit(tracing.bind(analyze_group), start) for start in starts]]
+            analyses = [a for a in results if a is not None]
+            failed_groups = len(results) - len(analyses)
+            if not analyses:
+                raise Exception("All cross-validation groups failed")
+            
+            # Merge level by level until a single analysis is left
+            while len(analyses) > 1:
+                groups = [analyses[i:i + fan_in] for i in range(0, len(analyses), fan_in)]
+                futures = [executor.submit(tracing.bind(self._merge_analyses), group, use_cache, deadline) for group in groups]
+                analyses = [f.result() for f in futures]
+        
+        return {
+            "cross_validation": json.dumps(analyses[0]),
+            "groups": len(results),
+            "failed_groups": failed_groups
+        }
@@ -0,0 +1,133 @@
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Numeric span attributes that are summed into counters when exporting
+COUNTERS = ("bytes", "prompt_tokens", "completion_tokens", "cache_hits", "retries")
+
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar("citesight_tracer", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("citesight_span", default=None)
+
+
+class Span:
+    """A timed stage of the pipeline with the counters recorded while it ran"""
+    __slots__ = ("name", "start", "end", "attributes")
+
+    def __init__(self, name: str, start: float, attributes: Dict):
+        self.name = name
+        self.start = start
+        self.end: Optional[float] = None
+        self.attributes = attributes
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "start": round(self.start, 4),
+            "duration": round((self.end if self.end is not None else self.start) - self.start, 4),
+            "attributes": self.attributes
+        }
+
+
+class Tracer:
+    """
+    Collects the spans of one research run
+
+    Span times are monotonic seconds since the tracer was created, so they
+    can be drawn as a waterfall.
+    """
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def to_dicts(self) -> List[Dict]:
+        with self._lock:
+            return [span.to_dict() for span in self.spans if span.end is not None]
+
+
+@contextmanager
+def use(tracer: Optional[Tracer]) -> Iterator[None]:
+    """Make `tracer` the one that span() records into, for the current thread/context"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """
+    Time a stage of the pipeline
+
+    Does nothing beyond timing when no tracer is active, so tools can be
+    instrumented unconditionally.
+    """
+    tracer = _current_tracer.get()
+    origin = tracer.origin if tracer is not None else time.monotonic()
+    current = Span(name, time.monotonic() - origin, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.attributes["error"] = str(e)
+        raise
+    finally:
+        current.end = time.monotonic() - origin
+        _current_span.reset(token)
+        if tracer is not None:
+            with tracer._lock:
+                tracer.spans.append(current)
+
+
+def increment(key: str, amount: float = 1):
+    """Add to a counter attribute on the innermost active span"""
+    current = _current_span.get()
+    if current is not None:
+        current.attributes[key] = current.attributes.get(key, 0) + amount
+
+
+def bind(fn: Callable) -> Callable:
+    """
+    Carry the caller's tracer and span into a function run on another thread
+
+    Call this in the submitting thread, once per submission.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+def to_json_lines(spans: List[Dict]) -> str:
+    """Export spans as one JSON object per line"""
+    return "\n".join(json.dumps(s) for s in spans) + ("\n" if spans else "")
+
+
+def to_prometheus(spans: List[Dict]) -> str:
+    """Export per-stage durations and counters in the Prometheus text format"""
+    stages: Dict[str, Dict] = {}
+    for s in spans:
+        stage = stages.setdefault(s["name"], {"sum": 0.0, "count": 0, **{c: 0 for c in COUNTERS}})
+        stage["sum"] += s["duration"]
+        stage["count"] += 1
+        for counter in COUNTERS:
+            value = s["attributes"].get(counter)
+            if isinstance(value, (int, float)):
+                stage[counter] += value
+
+    lines = [
+        "# HELP citesight_stage_duration_seconds Time spent in each pipeline stage",
+        "# TYPE citesight_stage_duration_seconds summary"
+    ]
+    for name, stage in sorted(stages.items()):
+        lines.append(f'citesight_stage_duration_seconds_sum{{stage="{name}"}} {stage["sum"]:.4f}')
+        lines.append(f'citesight_stage_duration_seconds_count{{stage="{name}"}} {stage["count"]}')
+    for counter in COUNTERS:
+        metric = f"citesight_{counter}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for name, stage in sorted(stages.items()):
+            lines.append(f'{metric}{{stage="{name}"}} {stage[counter]:g}')
+    return "\n".join(lines) + "\n"